@@ -10,8 +10,27 @@ from glambie.config.yaml_helpers import region_run_config_class_representer, yea
 from glambie.const.data_groups import GLAMBIE_DATA_GROUPS, GlambieDataGroup
 import os
 
+try:  # use the faster LibYAML bindings when available
+    from yaml import CDumper as YamlDumper
+except ImportError:
+    from yaml import Dumper as YamlDumper
+
 log = logging.getLogger(__name__)
 
+_yaml_representers_registered = False
+
+
+def _register_yaml_representers():
+    """
+    Registers the yaml representers for the config classes with the yaml dumper, only once per session
+    """
+    global _yaml_representers_registered
+    if _yaml_representers_registered:
+        return
+    yaml.add_representer(RegionRunConfig, region_run_config_class_representer, Dumper=YamlDumper)
+    yaml.add_representer(YearType, year_type_class_representer, Dumper=YamlDumper)
+    _yaml_representers_registered = True
+
 
 class Config(ABC):
     """
@@ -66,10 +85,9 @@ class RegionRunConfig(Config):
             self.year_type = YearType(self.year_type)
 
     def save_to_yaml(self, out_path):
-        yaml.add_representer(RegionRunConfig, region_run_config_class_representer)
-        yaml.add_representer(YearType, year_type_class_representer)
+        _register_yaml_representers()
         with open(out_path, 'w') as outfile:
-            outfile.write(yaml.dump(self))
+            outfile.write(yaml.dump(self, Dumper=YamlDumper))
 
 
 @dataclass
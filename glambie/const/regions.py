@@ -21,17 +21,17 @@ class RGIRegion():
 
         Parameters
         ----------
-        start_date : float
-            start date of time period to be considered
-        end_date : float
-            end date of time period to be considered
+        start_date : float or np.ndarray
+            start date of time period to be considered, or an array of start dates
+        end_date : float or np.ndarray
+            end date of time period to be considered, or an array of end dates
         rgi_area_version : int, optional
             version of RGI area, currently implemented are 5, 6 and 7, by default 6
 
         Returns
         -------
-        float
-            adjusted area to time period given in km2
+        float or np.ndarray
+            adjusted area to time period given in km2, an array of areas if arrays of dates are given
         """
         time_period_mean = (start_date + end_date) / 2
         static_area = getattr(self, "rgi{}_area".format(str(rgi_area_version)))
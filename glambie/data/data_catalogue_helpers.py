@@ -34,23 +34,21 @@ def calibrate_timeseries_with_trends_catalogue(catalogue_with_trends: DataCatalo
 
     # calibrate annual trends with longterm trend
     calibrated_series = []
+    df_calibration = calibration_timeseries.data.as_dataframe()
     for ds in catalogue_with_trends.datasets:
         # 1) calibrate timeseries
-        calibrated_s, dist_mat = calibrate_timeseries_with_trends(ds.data.as_dataframe(),
-                                                                  calibration_timeseries.data.as_dataframe())
+        df_trends = ds.data.as_dataframe()
+        calibrated_s, dist_mat = calibrate_timeseries_with_trends(df_trends, df_calibration)
         # 2) calculate mean calibration timeseries from all the different curves
         mean_calibrated_ts = combine_calibrated_timeseries(calibrated_s, dist_mat, p_value=0,
                                                            calculate_outside_calibrated_series_period=False)
-        df_mean_calibrated = pd.DataFrame({"start_dates": calibration_timeseries.data
-                                           .as_dataframe().start_dates,
-                                           "end_dates": calibration_timeseries.data
-                                           .as_dataframe().end_dates, "changes": mean_calibrated_ts})
+        df_mean_calibrated = pd.DataFrame({"start_dates": df_calibration.start_dates,
+                                           "end_dates": df_calibration.end_dates, "changes": mean_calibrated_ts})
         df_mean_calibrated_na_removed = df_mean_calibrated[~df_mean_calibrated["changes"].isna()]
 
         # CALCULATE UNCERTAINTIES
         # The uncertainty of a calibrated time series is calculated by combining
         # the uncertainties of the anomalies and of the long-term trend
-        df_trends = ds.data.as_dataframe()
         trend_uncertainties = df_trends.errors  # remove na lines
         calibration_timeseries_uncertainties = calibration_timeseries.data.errors[~df_mean_calibrated["changes"].isna()]
         # now convert trend uncertainties to same temporal unit as calibration_timeseries, e.g. annual
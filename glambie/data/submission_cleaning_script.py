@@ -289,10 +289,10 @@ def fix_non_grace_gravimetry_gaps(file_check_info_row: Tuple, submission_data_fr
     interpolated_data_frame = interpolate_change_per_day_to_fill_gaps(submission_data_frame)
 
     # Need to add back in the missing columns here
-    end_date_fractional = datetime_dates_to_fractional_years([datetime.strptime(
-        a, '%d/%m/%Y') for a in interpolated_data_frame.end_date])
-    start_date_fractional = datetime_dates_to_fractional_years([datetime.strptime(
-        a, '%d/%m/%Y') for a in interpolated_data_frame.start_date])
+    end_date_fractional = datetime_dates_to_fractional_years(pd.to_datetime(
+        interpolated_data_frame.end_date, format='%d/%m/%Y').to_numpy())
+    start_date_fractional = datetime_dates_to_fractional_years(pd.to_datetime(
+        interpolated_data_frame.start_date, format='%d/%m/%Y').to_numpy())
     interpolated_data_frame['unit'] = [submission_data_frame['unit'][0]
                                        for i in range(len(interpolated_data_frame))]
 
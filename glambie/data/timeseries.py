@@ -149,7 +149,7 @@ class TimeseriesData():
         boolean
             True if valid, False if not valid
         """
-        return all(start_date == end_date for start_date, end_date in zip(self.start_dates[1:], self.end_dates[:-1]))
+        return np.array_equal(np.asarray(self.start_dates)[1:], np.asarray(self.end_dates)[:-1])
 
 
 class Timeseries():
@@ -351,14 +351,14 @@ class Timeseries():
             object_copy = self.copy()
             object_copy.unit = "mwe"
             if str.lower(self.unit) == "m":
-                object_copy.data.changes = np.array(meters_to_meters_water_equivalent(object_copy.data.changes,
-                                                                                      density_of_water=density_of_water,
-                                                                                      density_of_ice=density_of_ice))
+                object_copy.data.changes = meters_to_meters_water_equivalent(object_copy.data.changes,
+                                                                             density_of_water=density_of_water,
+                                                                             density_of_ice=density_of_ice)
                 # Uncertainties
                 # First, convert elevation change error in m to mwe
-                object_copy.data.errors = np.array(meters_to_meters_water_equivalent(object_copy.data.errors,
-                                                                                     density_of_water=density_of_water,
-                                                                                     density_of_ice=density_of_ice))
+                object_copy.data.errors = meters_to_meters_water_equivalent(object_copy.data.errors,
+                                                                            density_of_water=density_of_water,
+                                                                            density_of_ice=density_of_ice)
                 # Second, include density uncertainty in error
                 density_unc = get_density_uncertainty_over_survey_period(self.data.max_temporal_resolution)
                 df = object_copy.data.as_dataframe()
@@ -379,11 +379,11 @@ class Timeseries():
                         - np.abs(object_copy.data.changes)**2 * area_unc**2)**0.5) / (
                             np.abs(object_copy.data.changes) * glacier_area)
                 # Second, convert errors to mwe
-                object_copy.data.errors = np.array(gigatonnes_to_meters_water_equivalent(
-                    errors_area_unc_removed, glacier_area, density_of_water=density_of_water))
+                object_copy.data.errors = gigatonnes_to_meters_water_equivalent(
+                    errors_area_unc_removed, glacier_area, density_of_water=density_of_water)
                 # convert changes
-                object_copy.data.changes = np.array(gigatonnes_to_meters_water_equivalent(
-                    object_copy.data.changes, glacier_area, density_of_water=density_of_water))
+                object_copy.data.changes = gigatonnes_to_meters_water_equivalent(
+                    object_copy.data.changes, glacier_area, density_of_water=density_of_water)
                 return object_copy
             else:
                 raise NotImplementedError(
@@ -424,14 +424,13 @@ class Timeseries():
         # get area
         glacier_area = getattr(self.region, "rgi{}_area".format(str(rgi_area_version)))
 
-        object_copy = self.copy()
-        object_copy.unit = "Gt"
-
         if str.lower(self.unit) == "gt":  # no conversion needed as already in gt
             return self.copy()
         elif str.lower(self.unit) == "mwe":
-            object_copy.data.changes = np.array(meters_water_equivalent_to_gigatonnes(
-                self.data.changes, area_km2=glacier_area, density_of_water=density_of_water))
+            object_copy = self.copy()
+            object_copy.unit = "Gt"
+            object_copy.data.changes = meters_water_equivalent_to_gigatonnes(
+                self.data.changes, area_km2=glacier_area, density_of_water=density_of_water)
             # variables for uncertainty calculation
             # area_unc is calculated as a % of the total area. % can be defined individually per region.
             area_unc = glacier_area * self.region.area_uncertainty_percentage  # use individual glacier area unc
@@ -439,8 +438,8 @@ class Timeseries():
 
             # Uncertainties
             # First, convert elevation change uncertaintiesr in mwe to Gt
-            object_copy.data.errors = np.array(meters_water_equivalent_to_gigatonnes(
-                self.data.errors, area_km2=glacier_area, density_of_water=density_of_water))
+            object_copy.data.errors = meters_water_equivalent_to_gigatonnes(
+                self.data.errors, area_km2=glacier_area, density_of_water=density_of_water)
             # Second, include area uncertainty in uncertainty
             df = object_copy.data.as_dataframe()
             # also see formula in Glambie Assessment Algorithm document, section 5.2 Homogenization of data
@@ -489,19 +488,15 @@ class Timeseries():
         glacier_area = getattr(self.region, "rgi{}_area".format(str(rgi_area_version)))
 
         object_copy = self.copy()
-        # conversion with area change
-        adjusted_changes = []
-        adjusted_areas = []
-
-        df = self.data.as_dataframe()
-        for start_date, end_date, change in zip(df["start_dates"], df["end_dates"], df["changes"]):
-            adjusted_area = self.region.get_adjusted_area(start_date, end_date, rgi_area_version=rgi_area_version)
-            if apply_area_change:
-                adjusted_changes.append(glacier_area / adjusted_area * change)
-            else:  # remove change
-                adjusted_changes.append(change / (glacier_area / adjusted_area))
-            adjusted_areas.append(adjusted_area)
-        object_copy.data.changes = np.array(adjusted_changes)
+        # conversion with area change, using the adjusted area of each time period
+        adjusted_areas = self.region.get_adjusted_area(np.asarray(self.data.start_dates, dtype=float),
+                                                       np.asarray(self.data.end_dates, dtype=float),
+                                                       rgi_area_version=rgi_area_version)
+        changes = np.asarray(self.data.changes, dtype=float)
+        if apply_area_change:
+            object_copy.data.changes = glacier_area / adjusted_areas * changes
+        else:  # remove change
+            object_copy.data.changes = changes / (glacier_area / adjusted_areas)
         object_copy.area_change_applied = apply_area_change  # store if has been applied or not
         return object_copy
 
@@ -761,18 +756,22 @@ class Timeseries():
 
         object_copy = self.copy()
         if not self.timeseries_is_annual_grid(year_type=year_type):  # if already annual then no need to homogenize
+            df_calibration = seasonal_calibration_dataset.data.as_dataframe()
             # 1) calibrate calibration series with trends from timeseries
-            calibrated_s, dist_mat = calibrate_timeseries_with_trends(self.data.as_dataframe(),
-                                                                      seasonal_calibration_dataset.data.as_dataframe())
+            trends = {"start_dates": self.data.start_dates, "end_dates": self.data.end_dates,
+                      "changes": self.data.changes}
+            calibrated_s, dist_mat = calibrate_timeseries_with_trends(trends, df_calibration)
             # 2) calculate mean calibration timeseries from all the different curves
             mean_calibrated_ts = combine_calibrated_timeseries(calibrated_s, dist_mat, p_value=p_value,
                                                                calculate_outside_calibrated_series_period=True)
-            df_mean_calibrated = pd.DataFrame({"start_dates": seasonal_calibration_dataset.data
-                                               .as_dataframe().start_dates,
-                                               "end_dates": seasonal_calibration_dataset.data
-                                              .as_dataframe().end_dates, "changes": mean_calibrated_ts})
+            df_mean_calibrated = pd.DataFrame({"start_dates": df_calibration.start_dates,
+                                               "end_dates": df_calibration.end_dates, "changes": mean_calibrated_ts})
             # 3) remove nan values where timeseries didn't cover
             df_mean_calibrated = df_mean_calibrated[~df_mean_calibrated.isna()].reset_index()
+            # make cumulative timeseries of calibrated high resolution dataset for start and end balances,
+            # used for the temporal homogenization error below
+            df_mean_calibrated_cumulative = df_mean_calibrated.copy()
+            df_mean_calibrated_cumulative.changes = df_mean_calibrated.changes.cumsum()
 
             # 4) read out homogenized values
             # get desired annual grid, buffer 2 years to work with start and end dates and include rounded years
@@ -797,10 +796,7 @@ class Timeseries():
                         new_change = df_filtered_year["changes"].sum()
 
                         # CALCULATE ERROR
-                        # 1 calculate temporal homogenization error
-                        # make cumulative timeseries of calibrated high resolution dataset for start and end balances
-                        df_mean_calibrated_cumulative = df_mean_calibrated.copy()
-                        df_mean_calibrated_cumulative.changes = df_mean_calibrated.changes.cumsum()
+                        # 1 calculate temporal homogenization error from the cumulative calibrated timeseries
                         df_filtered_year_cum_initial_dates = df_mean_calibrated_cumulative[
                             (df_mean_calibrated_cumulative.start_dates >= start_date)
                             & (df_mean_calibrated_cumulative.end_dates <= end_date)]
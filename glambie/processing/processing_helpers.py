@@ -1,3 +1,4 @@
+from collections import defaultdict
 import logging
 from typing import Tuple
 
@@ -41,63 +42,72 @@ def filter_catalogue_with_config_settings(data_group: GlambieDataGroup,
         Tuple[data_catalogue_annual, data_catalogue_trend]
         the filtered catalogue for annual datasets and for longterm trend datasets
     """
-    data_catalogue_original = data_catalogue.copy()
+    base_path = data_catalogue.base_path
+    region_run_settings = region_config.region_run_settings[data_group.name]
+    data_group_is_demdiff_and_glaciological = data_group == GLAMBIE_DATA_GROUPS["demdiff_and_glaciological"]
+
+    # index the region's datasets by data group once, rather than scanning the whole catalogue for each data group
+    datasets_by_data_group = defaultdict(list)
+    for ds in data_catalogue.get_filtered_catalogue(region_name=region_config.region_name).datasets:
+        datasets_by_data_group[ds.data_group.name].append(ds)
+    data_catalogue_combined = DataCatalogue.from_list(datasets_by_data_group[GLAMBIE_DATA_GROUPS["combined"].name],
+                                                      base_path=base_path)
 
     # 1 filter by data group and region
-    if data_group != GLAMBIE_DATA_GROUPS["demdiff_and_glaciological"]:
-        data_catalogue = data_catalogue.get_filtered_catalogue(
-            data_group=data_group.name, region_name=region_config.region_name)
+    if not data_group_is_demdiff_and_glaciological:
+        datasets = datasets_by_data_group[data_group.name]
     else:
-        data_catalogue_demdiff = data_catalogue.get_filtered_catalogue(
-            data_group=GLAMBIE_DATA_GROUPS["demdiff"].name, region_name=region_config.region_name)
-        data_catalogue_glaciological = data_catalogue.get_filtered_catalogue(
-            data_group=GLAMBIE_DATA_GROUPS["glaciological"].name, region_name=region_config.region_name)
         # concatenate demdiff and glaciological into one
-        data_catalogue = DataCatalogue.from_list(data_catalogue_demdiff.datasets
-                                                 + data_catalogue_glaciological.datasets,
-                                                 base_path=data_catalogue.base_path)
+        datasets = datasets_by_data_group[GLAMBIE_DATA_GROUPS["demdiff"].name] \
+            + datasets_by_data_group[GLAMBIE_DATA_GROUPS["glaciological"].name]
+
+    # pair each dataset with its lower case user group name, so that names are only lowered once
+    datasets_with_user_group_lower = [(d, d.user_group.lower()) for d in datasets]
+
     # 2 filter out what has been specified in config for annual datasets
-    datasets_annual = data_catalogue.datasets.copy()
-    exclude_annual_datasets = region_config.region_run_settings[data_group.name].get("exclude_annual_datasets", [])
+    exclude_annual_datasets = region_run_settings.get("exclude_annual_datasets", [])
     log.info('Excluding the following datasets from ANNUAL calculations: datasets=%s', exclude_annual_datasets)
-    for ds in exclude_annual_datasets:
-        if ds is not None:
-            datasets_annual = [d for d in datasets_annual if d.user_group.lower() != ds.lower()]
-    if data_group == GLAMBIE_DATA_GROUPS["demdiff_and_glaciological"]:
+    exclude_annual_user_groups = {ds.lower() for ds in exclude_annual_datasets if ds is not None}
+    datasets_annual = [d for d, ug in datasets_with_user_group_lower if ug not in exclude_annual_user_groups]
+    if data_group_is_demdiff_and_glaciological:
         datasets_annual = [d for d in datasets_annual if d.data_group != GLAMBIE_DATA_GROUPS["demdiff"]]
 
     # 3 filter out what has been specified in config for longterm trend datasets
-    datasets_trend = data_catalogue.datasets.copy()
-    exclude_trend_datasets = region_config.region_run_settings[data_group.name].get("exclude_trend_datasets", [])
+    exclude_trend_datasets = region_run_settings.get("exclude_trend_datasets", [])
     log.info('Excluding the following datasets from TREND calculations: datasets=%s', exclude_trend_datasets)
-    for ds in exclude_trend_datasets:
-        if ds is not None:
-            datasets_trend = [d for d in datasets_trend if d.user_group.lower() != ds.lower()]
-    if data_group == GLAMBIE_DATA_GROUPS["demdiff_and_glaciological"]:
+    exclude_trend_user_groups = {ds.lower() for ds in exclude_trend_datasets if ds is not None}
+    datasets_trend = [d for d, ug in datasets_with_user_group_lower if ug not in exclude_trend_user_groups]
+    if data_group_is_demdiff_and_glaciological:
         datasets_trend = [d for d in datasets_trend if d.data_group != GLAMBIE_DATA_GROUPS["glaciological"]]
 
     # 4 add additional combined datasets stated in configs to data group
     additional_annual_datasets = get_additional_combined_datasets(
-        data_catalogue=data_catalogue_original, data_group=data_group,
+        data_catalogue=data_catalogue_combined, data_group=data_group,
         region_config=region_config, type_of_information="annual")
     additional_trend_datasets = get_additional_combined_datasets(
-        data_catalogue=data_catalogue_original, data_group=data_group,
+        data_catalogue=data_catalogue_combined, data_group=data_group,
         region_config=region_config, type_of_information="trend")
     # combined solution should have a symbol so that they are recognized in the plots
-    for ds in additional_annual_datasets:
-        ds.user_group = ds.user_group + "_#"
-    for ds in additional_trend_datasets:
-        if ds not in additional_annual_datasets:
-            ds.user_group = ds.user_group + "_#"
+    # only the renamed datasets are copied, so that the input catalogue is left untouched
+    renamed_datasets = {}
+    for ds in additional_annual_datasets + additional_trend_datasets:
+        if id(ds) not in renamed_datasets:
+            renamed_dataset = ds.copy()
+            renamed_dataset.user_group = renamed_dataset.user_group + "_#"
+            renamed_datasets[id(ds)] = renamed_dataset
+    additional_annual_datasets = [renamed_datasets[id(ds)] for ds in additional_annual_datasets]
+    additional_trend_datasets = [renamed_datasets[id(ds)] for ds in additional_trend_datasets]
 
     datasets_annual.extend(additional_annual_datasets)
     datasets_trend.extend(additional_trend_datasets)
-    log.info('Including the following combined datasets to ANNUAL calculations: datasets=%s',
-             additional_annual_datasets)
-    log.info('Including the following combined datasets to TREND calculations: datasets=%s', additional_trend_datasets)
+    if log.isEnabledFor(logging.INFO):  # only build the lists of user group names when they are logged
+        log.info('Including the following combined datasets to ANNUAL calculations: datasets=%s',
+                 [ds.user_group for ds in additional_annual_datasets])
+        log.info('Including the following combined datasets to TREND calculations: datasets=%s',
+                 [ds.user_group for ds in additional_trend_datasets])
 
-    data_catalogue_annual = DataCatalogue.from_list(datasets_annual, base_path=data_catalogue.base_path)
-    data_catalogue_trend = DataCatalogue.from_list(datasets_trend, base_path=data_catalogue.base_path)
+    data_catalogue_annual = DataCatalogue.from_list(datasets_annual, base_path=base_path)
+    data_catalogue_trend = DataCatalogue.from_list(datasets_trend, base_path=base_path)
 
     return data_catalogue_annual, data_catalogue_trend
 
@@ -124,15 +134,19 @@ def get_additional_combined_datasets(data_catalogue: DataCatalogue, data_group:
         a list of Timeseries of the data source 'combined' which have been identified
     """
     additional_datasets = []
-    if "include_combined_{}_datasets".format(type_of_information) in region_config.region_run_settings[data_group.name]:
-        include_combined_datasets = region_config.region_run_settings[data_group.name].get(
-            "include_combined_{}_datasets".format(type_of_information), [])
+    region_run_settings = region_config.region_run_settings[data_group.name]
+    include_combined_datasets_key = "include_combined_{}_datasets".format(type_of_information)
+    if include_combined_datasets_key in region_run_settings:
+        include_combined_datasets = region_run_settings.get(include_combined_datasets_key, [])
         include_combined_datasets = [x for x in include_combined_datasets if x is not None]
+        # look up combined datasets by their lower case user group, keeping the first match as before
+        combined_datasets_by_user_group = {}
+        for d in data_catalogue.get_filtered_catalogue(data_group="combined",
+                                                       region_name=region_config.region_name).datasets:
+            combined_datasets_by_user_group.setdefault(d.user_group.lower(), d)
         for ds in include_combined_datasets:
-            catalogue_filtered = data_catalogue.get_filtered_catalogue(
-                data_group="combined", region_name=region_config.region_name, user_group=ds)
-            if len(catalogue_filtered.datasets) > 0:
-                additional_datasets.append(catalogue_filtered.datasets[0])
+            if ds.lower() in combined_datasets_by_user_group:
+                additional_datasets.append(combined_datasets_by_user_group[ds.lower()])
             else:
                 log.info("Cannot find and add the following combined dataset to %s datasets: %s",
                          type_of_information, ds)
@@ -187,9 +201,9 @@ def convert_datasets_to_annual_trends(data_catalogue: DataCatalogue,
     DataCatalogue
         New data catalogue with converted data
     """
-    data_catalogue = convert_datasets_to_monthly_grid(data_catalogue)
     datasets = []
     for ds in data_catalogue.datasets:
+        ds = ds.convert_timeseries_to_monthly_grid()
         if ds.data.max_temporal_resolution == ds.data.min_temporal_resolution == 1:
             ds = ds.convert_timeseries_to_unit_mwe()
 
@@ -243,9 +257,9 @@ def convert_datasets_to_longterm_trends_in_unit_mwe(
     DataCatalogue
         New data catalogue with converted data
     """
-    data_catalogue = convert_datasets_to_monthly_grid(data_catalogue)
     datasets = []
     for original_dataset in data_catalogue.datasets:
+        original_dataset = original_dataset.convert_timeseries_to_monthly_grid()
         temporal_resolution = original_dataset.data.max_temporal_resolution
         # remove any dates outside minimum and maximum
         if output_trend_date_range is not None:
@@ -433,32 +447,46 @@ def extend_annual_timeseries_if_shorter_than_time_window(
         this will be the same as 'annual_timeseries'
     """
     annual_timeseries_copy = annual_timeseries.copy()
-    if (desired_time_window[0] < min(annual_timeseries_copy.data.start_dates)) \
-            or (desired_time_window[1] > max(annual_timeseries_copy.data.end_dates)) \
+    annual_min_start_date = annual_timeseries_copy.data.min_start_date
+    annual_max_end_date = annual_timeseries_copy.data.max_end_date
+    if (desired_time_window[0] < annual_min_start_date) \
+            or (desired_time_window[1] > annual_max_end_date) \
             or not annual_timeseries_copy.data.is_cumulative_valid():  # or the case where the timeseries has a gap
         log.info("The trends are longer than the annual timeseries. Extension of annual will be performed.")
 
         # Remove trend of timeseries for extension over the common time period
-        catalogue_dfs = [annual_timeseries_copy.data.as_dataframe(), timeseries_for_extension.data.as_dataframe()]
-        start_ref_period = np.max([df.start_dates.min() for df in catalogue_dfs])
-        end_ref_period = np.min([df.end_dates.max() for df in catalogue_dfs])
+        catalogue_data = [annual_timeseries_copy.data, timeseries_for_extension.data]
+        start_ref_period = max(annual_min_start_date, timeseries_for_extension.data.min_start_date)
+        end_ref_period = min(annual_max_end_date, timeseries_for_extension.data.max_end_date)
         if not start_ref_period < end_ref_period:
             warnings.warn("No common period detected when removing trends.", stacklevel=2)
-        for df in catalogue_dfs:
-            df_sub = df[(df["start_dates"] >= start_ref_period) & (df["end_dates"] <= end_ref_period)]
-            df["changes"] = df["changes"] - df_sub["changes"].mean()  # edit the dataframe
-
-        # Combine with other timeseries to cover the missing timespan
-        df_merged = pd.merge(catalogue_dfs[0], catalogue_dfs[1], on=["start_dates", "end_dates"], how="outer")
+        date_pairs, changes, errors = [], [], []
+        for ts_data in catalogue_data:
+            start_dates, end_dates = np.asarray(ts_data.start_dates), np.asarray(ts_data.end_dates)
+            ts_changes = np.array(ts_data.changes, dtype=float)  # copy, as the timeseries for extension is not ours
+            in_ref_period = (start_dates >= start_ref_period) & (end_dates <= end_ref_period)
+            with warnings.catch_warnings():  # no common period gives a NaN mean, which has been warned about above
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                ts_changes -= np.nanmean(ts_changes[in_ref_period])
+            date_pairs.append(np.column_stack([start_dates, end_dates]))
+            changes.append(ts_changes)
+            errors.append(np.asarray(ts_data.errors, dtype=float))
+
+        # Combine with other timeseries to cover the missing timespan, i.e. an outer join on (start_date, end_date)
+        merged_dates, inverse = np.unique(np.concatenate(date_pairs), axis=0, return_inverse=True)
+        annual_idx, extension_idx = np.split(inverse.ravel(), [len(date_pairs[0])])
+        merged_changes = np.full(len(merged_dates), np.nan)
+        merged_errors = np.full(len(merged_dates), np.nan)
+        merged_changes[extension_idx] = changes[1]
+        merged_errors[extension_idx] = errors[1]
         # Fill Nans in 'annual_timeseries' with values from 'timeseries_for_extension'
-        df_merged.changes_x.fillna(df_merged.changes_y, inplace=True)
-        df_merged.errors_x.fillna(df_merged.errors_y, inplace=True)
-        df_merged = df_merged.sort_values(by="start_dates").reset_index()
-        # now update the annual timeseries object with the extended timeseries
-        annual_timeseries_copy.data.changes = np.array(df_merged["changes_x"])
-        annual_timeseries_copy.data.errors = np.array(df_merged["errors_x"])
-        annual_timeseries_copy.data.start_dates = np.array(df_merged["start_dates"])
-        annual_timeseries_copy.data.end_dates = np.array(df_merged["end_dates"])
+        merged_changes[annual_idx] = np.where(np.isnan(changes[0]), merged_changes[annual_idx], changes[0])
+        merged_errors[annual_idx] = np.where(np.isnan(errors[0]), merged_errors[annual_idx], errors[0])
+        # now update the annual timeseries object with the extended timeseries, which is sorted by date
+        annual_timeseries_copy.data.changes = merged_changes
+        annual_timeseries_copy.data.errors = merged_errors
+        annual_timeseries_copy.data.start_dates = merged_dates[:, 0]
+        annual_timeseries_copy.data.end_dates = merged_dates[:, 1]
     return annual_timeseries_copy
 
 
@@ -486,19 +514,21 @@ def check_and_handle_gaps_in_timeseries(data_catalogue: DataCatalogue) -> Tuple[
     list_of_split_series = []
     for timeseries in data_catalogue.datasets:
         if not timeseries.data.is_cumulative_valid():  # if invalid convert to handle the gaps
-            # 1 split timeseries dataframe
-            df_data = timeseries.data.as_dataframe()
-            split_dataframes = slice_timeseries_at_gaps(df_data)
+            # 1 find where to split the timeseries
+            start_dates, end_dates = np.asarray(timeseries.data.start_dates), np.asarray(timeseries.data.end_dates)
+            split_indices = _get_gap_indices(start_dates, end_dates)
+            slice_bounds = zip(np.r_[0, split_indices], np.r_[split_indices, len(start_dates)])
             # 2 add split timeseries to new_datasets
             grouped_timeseries = []
-            for idx, split_timeseries in enumerate(split_dataframes):
+            for idx, (start, end) in enumerate(slice_bounds):
                 timeseries_copy = timeseries.copy()
                 # rename user group name to be unique
                 timeseries_copy.user_group = f"{timeseries_copy.user_group }_{str(idx+1)}"
-                timeseries_copy.data.changes = np.array(split_timeseries["changes"])
-                timeseries_copy.data.errors = np.array(split_timeseries["errors"])
-                timeseries_copy.data.start_dates = np.array(split_timeseries["start_dates"])
-                timeseries_copy.data.end_dates = np.array(split_timeseries["end_dates"])
+                # slices are views into the arrays of the copy, so the original timeseries is not shared
+                timeseries_copy.data.changes = np.asarray(timeseries_copy.data.changes)[start:end]
+                timeseries_copy.data.errors = np.asarray(timeseries_copy.data.errors)[start:end]
+                timeseries_copy.data.start_dates = np.asarray(timeseries_copy.data.start_dates)[start:end]
+                timeseries_copy.data.end_dates = np.asarray(timeseries_copy.data.end_dates)[start:end]
                 new_datasets.append(timeseries_copy)
                 grouped_timeseries.append(timeseries_copy.user_group)
             list_of_split_series.append(grouped_timeseries)
@@ -524,19 +554,30 @@ def slice_timeseries_at_gaps(df_timeseries: pd.DataFrame) -> list[pd.DataFrame]:
     list[pd.DataFrame]
         a list with slices of the original dataframe. All new dataframes within the list are gapless.
     """
-    split_indices = []
-    split_timeseries_dataframes = []
-    for idx, end_date in enumerate(df_timeseries["end_dates"].iloc[:-1]):
-        # If end_date != start_date for any of the consecutive rows, append to indices where df is split
-        if end_date != df_timeseries["start_dates"].iloc[idx + 1]:
-            split_indices.append(idx)
-    previous_index = 0
-    for split_index in split_indices:
-        split_timeseries_dataframes.append(df_timeseries.iloc[previous_index:split_index + 1].reset_index(drop=True))
-        previous_index = split_index + 1
-    # plus append last / full split in the end
-    split_timeseries_dataframes.append(df_timeseries.iloc[previous_index:].reset_index(drop=True))
-    return split_timeseries_dataframes
+    split_indices = _get_gap_indices(df_timeseries["start_dates"].to_numpy(), df_timeseries["end_dates"].to_numpy())
+    slice_starts = np.r_[0, split_indices]
+    slice_ends = np.r_[split_indices, len(df_timeseries)]
+    return [df_timeseries.iloc[start:end].reset_index(drop=True) for start, end in zip(slice_starts, slice_ends)]
+
+
+def _get_gap_indices(start_dates: np.ndarray, end_dates: np.ndarray) -> np.ndarray:
+    """
+    Finds the indices at which a timeseries needs to be split to remove temporal gaps.
+    If end_date != start_date for any of the consecutive rows, the timeseries is split before the next row.
+
+    Parameters
+    ----------
+    start_dates : np.ndarray
+        start dates of the timeseries
+    end_dates : np.ndarray
+        end dates of the timeseries
+
+    Returns
+    -------
+    np.ndarray
+        indices of the rows that start a new gapless slice, empty if the timeseries has no gaps
+    """
+    return np.flatnonzero(end_dates[:-1] != start_dates[1:]) + 1
 
 
 def recombine_split_timeseries_in_catalogue(data_catalogue: DataCatalogue,
@@ -557,51 +598,58 @@ def recombine_split_timeseries_in_catalogue(data_catalogue: DataCatalogue,
     -------
     DataCatalogue
         data catalogue with timeseries that are now recombined
+
+    Raises
+    ------
+    KeyError
+        If any of the split datasets cannot be found in the data catalogue
+    ValueError
+        If the split datasets have duplicate dates when being combined
     """
     new_datasets = []
+    # look up datasets by their lower case user group, keeping the first match as the catalogue filter would
+    datasets_by_user_group = {}
+    for dataset in data_catalogue.datasets:
+        datasets_by_user_group.setdefault(dataset.user_group.lower(), dataset)
     # split datasets
     for split_ds_list in names_of_split_datasets_in_catalogue:
-        old_datasets = [data_catalogue.get_filtered_catalogue(user_group=s).datasets[0] for s in split_ds_list]
-        start_dates = []
-        end_dates = []
-        changes = []
-        errors = []
-        for ds in old_datasets:
-            start_dates.extend(ds.data.start_dates)
-            end_dates.extend(ds.data.end_dates)
-            changes.extend(ds.data.changes)
-            errors.extend(ds.data.errors)
-        df = pd.DataFrame({"start_dates": start_dates, "end_dates": end_dates,
-                           "changes": changes, "errors": errors})
-        df = df.sort_values(by="start_dates")
-        if len(start_dates) != len(np.unique(start_dates)) or len(end_dates) != len(np.unique(end_dates)):
+        missing_names = [s for s in split_ds_list if s.lower() not in datasets_by_user_group]
+        if missing_names:
+            raise KeyError(f"Split datasets not found in data catalogue: {missing_names}")
+        old_datasets = [datasets_by_user_group[s.lower()] for s in split_ds_list]
+        start_dates = np.concatenate([ds.data.start_dates for ds in old_datasets])
+        end_dates = np.concatenate([ds.data.end_dates for ds in old_datasets])
+        changes = np.concatenate([ds.data.changes for ds in old_datasets])
+        errors = np.concatenate([ds.data.errors for ds in old_datasets])
+        if np.unique(start_dates).size != start_dates.size or np.unique(end_dates).size != end_dates.size:
             error_msg = f'''Issue with combining split datasets, duplicate dates discovered when combining:
             {split_ds_list}'''
             log.error(error_msg)
             raise ValueError(error_msg)
+        sort_order = np.argsort(start_dates, kind="stable")
 
         # copy the metadata to the new combined dataset. we just take the first dataset of old datasets assuming all
         # split datasets have the same metadata as they have been split from the same original dataset
         new_dataset = old_datasets[0].copy()
         # fill dataset with new values
-        new_dataset.data.start_dates = np.array(df["start_dates"])
-        new_dataset.data.end_dates = np.array(df["end_dates"])
-        new_dataset.data.changes = np.array(df["changes"])
-        new_dataset.data.errors = np.array(df["errors"])
+        new_dataset.data.start_dates = start_dates[sort_order]
+        new_dataset.data.end_dates = end_dates[sort_order]
+        new_dataset.data.changes = changes[sort_order]
+        new_dataset.data.errors = errors[sort_order]
         new_dataset.user_group = new_dataset.user_group[:-2]  # remove the underscore and numbering from the name
         new_datasets.append(new_dataset)
 
     # now add all datasets to list that weren't split
+    split_dataset_names = {name for split_ds_list in names_of_split_datasets_in_catalogue for name in split_ds_list}
     for dataset in data_catalogue.datasets:
-        # check if in flattened list
-        if dataset.user_group not in [j for sub in names_of_split_datasets_in_catalogue for j in sub]:
+        if dataset.user_group not in split_dataset_names:
             new_datasets.append(dataset)
 
     new_data_catalogue = DataCatalogue.from_list(new_datasets, base_path=data_catalogue.base_path)
     return new_data_catalogue
 
 
-def set_unneeded_columns_to_nan(data_catalogue: DataCatalogue) -> DataCatalogue:
+def set_unneeded_columns_to_nan(data_catalogue: DataCatalogue, inplace: bool = False) -> DataCatalogue:
     """
     Sets data columns of TimeseriesData not needed in GlaMBIE processing algorithm to NaN within a DataCatalogue
     to simplify object manipulation
@@ -610,13 +658,16 @@ def set_unneeded_columns_to_nan(data_catalogue: DataCatalogue) -> DataCatalogue:
     ----------
     data_catalogue : DataCatalogue
         input data catalogue with Timeseries datasets to be manipulated
+    inplace : bool, optional
+        If set to True the datasets of the input catalogue are manipulated directly instead of a copy.
+        Only use this when the datasets are not shared with other catalogues, by default False
 
     Returns
     -------
     DataCatalogue
         manipulated data catalogue
     """
-    result_catalogue = data_catalogue.copy()
+    result_catalogue = data_catalogue if inplace else data_catalogue.copy()
     for timeseries in result_catalogue.datasets:
         timeseries.data.glacier_area_observed = None
         timeseries.data.glacier_area_reference = None
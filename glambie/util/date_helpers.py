@@ -1,8 +1,10 @@
-from datetime import datetime
-from datetime import timedelta
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import math
+from typing import Literal, Union
 
 
 def fractional_years_to_datetime_dates(fractional_year_list: list) -> list:
@@ -17,24 +19,38 @@ def fractional_years_to_datetime_dates(fractional_year_list: list) -> list:
     ----------
     A list of datetime dates
     """
-    converted_dates = [year2datetime(i) for i in fractional_year_list]
-    return converted_dates
-
-
-def datetime_dates_to_fractional_years(datetime_dates_list: list) -> list:
+    fractional_years = np.asarray(fractional_year_list, dtype=float)
+    years = fractional_years.astype(int)
+    calendar_years = (years - 1970).astype('datetime64[Y]')  # datetime64 counts years from 1970
+    year_starts = calendar_years.astype('datetime64[D]')
+    year_lengths_in_days = ((calendar_years + 1).astype('datetime64[D]') - year_starts).astype(int)
+    # split into whole days and rounded microseconds of the remaining day, the same way as datetime.timedelta does
+    days_within_years = (fractional_years - years) * year_lengths_in_days
+    whole_days = np.trunc(days_within_years)
+    microseconds_within_day = np.round((days_within_years - whole_days) * 86400e6)
+    return (year_starts + whole_days.astype('timedelta64[D]')
+            + microseconds_within_day.astype('timedelta64[us]')).tolist()
+
+
+def datetime_dates_to_fractional_years(datetime_dates_list: Union[list, np.ndarray, pd.DatetimeIndex]) -> list:
     """Function to convert a list of datetime dates to fractional years
 
     Parameters
     ----------
-    datetime_dates_list : list
-        list of datetime date objects
+    datetime_dates_list : Union[list, np.ndarray, pd.DatetimeIndex]
+        list of datetime date objects, or an already parsed datetime64 array / DatetimeIndex,
+        which avoids walking the individual datetime objects
 
     Returns
     ----------
     A list of fractional years
     """
-    converted_dates = [datetime2year(i) for i in datetime_dates_list]
-    return converted_dates
+    dates = np.asarray(datetime_dates_list, dtype='datetime64[us]')
+    calendar_years = dates.astype('datetime64[Y]')
+    year_starts = calendar_years.astype('datetime64[us]')
+    year_lengths = (calendar_years + 1).astype('datetime64[us]') - year_starts
+    # datetime64 counts years from 1970
+    return (calendar_years.astype(int) + 1970 + (dates - year_starts) / year_lengths).tolist()
 
 
 def datetime2year(datetime_date: datetime.date) -> float:
@@ -49,7 +65,7 @@ def datetime2year(datetime_date: datetime.date) -> float:
     ----------
     Date as a fractional year (decimal number)
     """
-    year_part = datetime_date - datetime(year=datetime_date.year, month=1, day=1)
+    year_part = datetime_date - _first_day_of_year(datetime_date.year)
     year_length = get_year_timedelta(datetime_date.year)
     return datetime_date.year + year_part / year_length
 
@@ -67,14 +83,14 @@ def year2datetime(fractional_year: float) -> datetime.date:
     Converted datetime object
     """
     year = int(fractional_year)
-    year_length = (
-        datetime(year=year + 1, month=1, day=1)
-        - datetime(year=year, month=1, day=1)
-    )
-    days_within_year = timedelta(days=(fractional_year - year) * (year_length.days))
-    day_one_of_year = datetime(year, 1, 1)
-    date = day_one_of_year + days_within_year
-    return date
+    year_length_in_days = 366 if calendar.isleap(year) else 365
+    return _first_day_of_year(year) + timedelta(days=(fractional_year - year) * year_length_in_days)
+
+
+@lru_cache(maxsize=512)
+def _first_day_of_year(year: int) -> datetime:
+    """Returns the first day of a year as datetime object, cached as dates tend to be clustered in few years"""
+    return datetime(year, 1, 1)
 
 
 def get_year_timedelta(year: int) -> timedelta:
@@ -82,14 +98,11 @@ def get_year_timedelta(year: int) -> timedelta:
     i.e. leap years will have 366 days, other years have 365 days
 
     '''
-    year_length = (
-        datetime(year=year + 1, month=1, day=1)
-        - datetime(year=year, month=1, day=1)
-    )
-    return year_length
+    return timedelta(days=366 if calendar.isleap(year) else 365)
 
 
-def get_years(desired_year_start: float, min_date: float, max_date: float, return_type="arrays"):
+def get_years(desired_year_start: float, min_date: float, max_date: float,
+              return_type: Literal["arrays", "dataframe"] = "arrays"):
     """
     Returns start and end dates of years within a timespan (min_date to max_date).
     Only full years within the min_date - max_date time period are included.
@@ -102,7 +115,7 @@ def get_years(desired_year_start: float, min_date: float, max_date: float, retur
         minimum date to be calculated for, in fractional years
     max_date : float
         maximum date to be calculated for, in fractional years
-    return_type : str, optional
+    return_type : Literal["arrays", "dataframe"], optional
         type in which the result is returned. Current options are: 'arrays' and 'dataframe', by default 'arrays'
 
     Returns
@@ -110,29 +123,28 @@ def get_years(desired_year_start: float, min_date: float, max_date: float, retur
     Tuple[np.array, np.array] or pd.DataFrame, depending on specified return_type
         'arrays': (start_dates, end_dates)
         'dataframe': pd.DataFrame({'start_dates': start_dates, 'end_dates': end_dates})
-    """
-    years = list(range(math.floor(min_date), math.ceil(max_date)))
 
-    start_dates = []
-    end_dates = []
-    for year in years:
+    Raises
+    ------
+    ValueError
+        If return_type is not one of the supported options
+    """
+    if return_type not in ("arrays", "dataframe"):
+        raise ValueError(f"Unrecognised return type '{return_type}'")
+    years = np.arange(math.floor(min_date), math.ceil(max_date))
+    if round(desired_year_start) == 1:
         # if glaciological year is closer to the end of the year
         # the glaciological year is starting around the end of the previous year
-        if round(desired_year_start) == 1:
-            start_date = float(year - 1 + desired_year_start)
-            end_date = float(year + desired_year_start)
-            if (start_date >= min_date) & (end_date <= max_date):
-                start_dates.append(start_date)
-                end_dates.append(end_date)
+        years = years - 1
+    elif round(desired_year_start) != 0:
         # if glaciological year is closer to the start of the year
-        # the glaciological year is starting around start of the current year
-        elif round(desired_year_start) == 0:
-            start_date = float(year + desired_year_start)
-            end_date = float(year + 1 + desired_year_start)
-            if (start_date >= min_date) & (end_date <= max_date):
-                start_dates.append(start_date)
-                end_dates.append(end_date)
+        # the glaciological year is starting around start of the current year, any other start gives no years
+        years = years[:0]
+    start_dates = (years + desired_year_start).astype(float)
+    end_dates = (years + 1 + desired_year_start).astype(float)
+    within_timespan = (start_dates >= min_date) & (end_dates <= max_date)
+    start_dates, end_dates = start_dates[within_timespan], end_dates[within_timespan]
     if return_type == "dataframe":
-        return pd.DataFrame({"start_dates": start_dates, "end_dates": end_dates})
-    elif return_type == "arrays":
-        return np.array(start_dates), np.array(end_dates)
+        # the date arrays are local, so the dataframe can take them over without copying
+        return pd.DataFrame({"start_dates": start_dates, "end_dates": end_dates}, copy=False)
+    return start_dates, end_dates
@@ -1,9 +1,10 @@
 from typing import Iterable
 from glambie.const import constants
+import numpy as np
 
 
 def meters_to_gigatonnes(variables: Iterable, area_km2: float,
-                         density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> list:
+                         density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of surface elevation change in meters into ice mass in gigatonnes,
     using the area of a region and the density of ice.
 
@@ -18,13 +19,14 @@ def meters_to_gigatonnes(variables: Iterable, area_km2: float,
 
     Returns
     -------
-    A list of measurements in gigatonnes
+    An array of measurements in gigatonnes
     """
-    return [i * density_of_ice * (area_km2 / 1e6) for i in variables]  # 1e6 to convert area from km2 to m2
+    # 1e6 to convert area from km2 to m2, the scalar factor is computed first so that the array is multiplied once
+    return np.asarray(variables, dtype=float) * (density_of_ice * (area_km2 / 1e6))
 
 
 def gigatonnes_to_meters(variables: Iterable, area_km2: float,
-                         density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> list:
+                         density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of ice mass in gigatonnes into surface elevation change in meters,
     using the area of a region and the density of ice.
 
@@ -39,14 +41,14 @@ def gigatonnes_to_meters(variables: Iterable, area_km2: float,
 
     Returns
     -------
-    A list of measurements in meters
+    An array of measurements in meters
     """
-    return [(1e6 * variable) / (area_km2 * density_of_ice) for variable in variables]
+    return np.asarray(variables, dtype=float) * (1e6 / (area_km2 * density_of_ice))
 
 
 def meters_to_meters_water_equivalent(variables: Iterable,
                                       density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3,
-                                      density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> list:
+                                      density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of surface elevation change in meters into meters water equivalent.
 
     Parameters
@@ -60,14 +62,14 @@ def meters_to_meters_water_equivalent(variables: Iterable,
 
     Returns
     -------
-    A list of measurements in meters water equivalent
+    An array of measurements in meters water equivalent
     """
-    return [(variable / density_of_water) * density_of_ice for variable in variables]
+    return np.asarray(variables, dtype=float) * (density_of_ice / density_of_water)
 
 
 def meters_water_equivalent_to_meters(variables: Iterable,
                                       density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3,
-                                      density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> list:
+                                      density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of surface elevation change in meters water equivalent into meters.
 
     Parameters
@@ -81,13 +83,13 @@ def meters_water_equivalent_to_meters(variables: Iterable,
 
     Returns
     -------
-    A list of measurements in meters
+    An array of measurements in meters
     """
-    return [(variable * density_of_water) / density_of_ice for variable in variables]
+    return np.asarray(variables, dtype=float) * (density_of_water / density_of_ice)
 
 
 def meters_water_equivalent_to_gigatonnes(variables: Iterable, area_km2: float,
-                                          density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3) -> list:
+                                          density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of ice mass loss in meters water equivalent to gigatonnes.
 
     Parameters
@@ -101,13 +103,14 @@ def meters_water_equivalent_to_gigatonnes(variables: Iterable, area_km2: float,
 
     Returns
     -------
-    A list of measurements in gigatonnes
+    An array of measurements in gigatonnes
     """
-    return [i * density_of_water * (area_km2 / 1e6) for i in variables]  # 1e6 to convert area from km2 to m2
+    # 1e6 to convert area from km2 to m2
+    return np.asarray(variables, dtype=float) * (density_of_water * (area_km2 / 1e6))
 
 
 def gigatonnes_to_meters_water_equivalent(variables: Iterable, area_km2: float,
-                                          density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3) -> list:
+                                          density_of_water: float = constants.DENSITY_OF_WATER_KG_PER_M3) -> np.ndarray:
     """Function to convert a list of measurements of ice mass loss in gigatonnes into meters water equivalent.
 
     Parameters
@@ -121,12 +124,13 @@ def gigatonnes_to_meters_water_equivalent(variables: Iterable, area_km2: float,
 
     Returns
     -------
-    A list of measurements in meters water equivalent
+    An array of measurements in meters water equivalent
     """
-    return [(1e6 * variable) / (area_km2 * density_of_water) for variable in variables]
+    return np.asarray(variables, dtype=float) * (1e6 / (area_km2 * density_of_water))
 
 
-def gigatonnes_to_sea_level_rise(variables: Iterable, ocean_area_km2: float = constants.OCEAN_AREA_IN_KM2) -> list:
+def gigatonnes_to_sea_level_rise(variables: Iterable,
+                                 ocean_area_km2: float = constants.OCEAN_AREA_IN_KM2) -> np.ndarray:
     """Function to convert a list of measurements of ice mass loss in gigatonnes into sea level rise (millimeters). We
     assume a value for the area of the ocean, and that all measured mass loss contributes to sea level change.
 
@@ -139,6 +143,33 @@ def gigatonnes_to_sea_level_rise(variables: Iterable, ocean_area_km2: float = co
 
     Returns
     -------
-    A list of measurements in sea level rise (millimeters)
+    An array of measurements in sea level rise (millimeters)
     """
-    return [abs(variable / ocean_area_km2) * 1e6 for variable in variables]  # 1e6 to convert area from km2 to m2
+    return np.abs(np.asarray(variables, dtype=float)) * (1e6 / ocean_area_km2)  # 1e6 to convert area from km2 to m2
+
+
+def meters_to_sea_level_rise(variables: Iterable, area_km2: float,
+                             density_of_ice: float = constants.DENSITY_OF_ICE_KG_PER_M3,
+                             ocean_area_km2: float = constants.OCEAN_AREA_IN_KM2) -> np.ndarray:
+    """Function to convert a list of measurements of surface elevation change in meters into sea level rise
+    (millimeters), using the area of a region and the density of ice.
+    Gives the same result as meters_to_gigatonnes followed by gigatonnes_to_sea_level_rise,
+    without creating the intermediate array in gigatonnes.
+
+    Parameters
+    ----------
+    variables : Iterable
+        A list of measurements in meters
+    area_km2 : float
+        The area of a region in km2
+    density_of_ice : float, optional
+        The density of ice in kg per m3, by default constants.DENSITY_OF_ICE_KG_PER_M3
+    ocean_area_km2 : float, optional
+        The assumed area of the ocean in km2, by default constants.OCEAN_AREA_IN_KM2
+
+    Returns
+    -------
+    An array of measurements in sea level rise (millimeters)
+    """
+    # the conversions of area from km2 to m2 cancel out between the glacier and the ocean area
+    return np.abs(np.asarray(variables, dtype=float)) * (density_of_ice * area_km2 / ocean_area_km2)
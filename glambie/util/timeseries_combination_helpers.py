@@ -1,9 +1,11 @@
+from typing import Mapping, Union
 import warnings
 import numpy as np
 import pandas as pd
 
 
-def calibrate_timeseries_with_trends(trends: pd.DataFrame, calibration_timeseries: pd.DataFrame):
+def calibrate_timeseries_with_trends(trends: Union[pd.DataFrame, Mapping[str, np.ndarray]],
+                                     calibration_timeseries: Union[pd.DataFrame, Mapping[str, np.ndarray]]):
     """
     This function calibrates a higher resolution calibration timeseries with the trends from a trend DataFrame.
     The 'calibration_timeseries' is adjusted over the common time period, to represent the new trend.
@@ -21,11 +23,11 @@ def calibrate_timeseries_with_trends(trends: pd.DataFrame, calibration_timeserie
 
     Parameters
     ----------
-    trends : pd.DataFrame
-        A dataframe containing longterm trends (derivative time series).
+    trends : Union[pd.DataFrame, Mapping[str, np.ndarray]]
+        A dataframe (or dictionary of arrays) containing longterm trends (derivative time series).
         Should contain columns "start_dates", "end_dates", "changes"
-    calibration_timeseries : pd.DataFrame
-        A dataframe containing a higher resolution timeseries (derivative time series).
+    calibration_timeseries : Union[pd.DataFrame, Mapping[str, np.ndarray]]
+        A dataframe (or dictionary of arrays) containing a higher resolution timeseries (derivative time series).
         Should contain columns "start_dates", "end_dates", "changes"
 
     Returns
@@ -37,42 +39,64 @@ def calibrate_timeseries_with_trends(trends: pd.DataFrame, calibration_timeserie
         2.) 2D array with a distance matrix for inverse distance calculations
             will contain the same dimensions as (1)
     """
-    calibrated_timeseries_list = []  # will be populated with each longterm trend calibrated series
-    distance_matrix_list = []
-    for _, longterm_trend in trends.iterrows():
-        # make sure that the longterm trend is within the calibration series
-        if (min(calibration_timeseries["start_dates"]) <= longterm_trend["start_dates"]) \
-                and (max(calibration_timeseries["end_dates"]) >= longterm_trend["end_dates"]):
-            # get slice of the high resolution calibration dataset corresponding to the trend timeperiod
-            calibration_slice = calibration_timeseries[((calibration_timeseries["start_dates"]
-                                                        >= longterm_trend["start_dates"])
-                                                        & (calibration_timeseries["end_dates"]
-                                                           <= longterm_trend["end_dates"]))]
-            # average of the high resolution calibratio timeseries over shared period
-            avg_calibration_slice = calibration_slice["changes"].mean()
-            # resample to same resolution as the calibration timeseries
-            avg_trend = longterm_trend['changes'] / calibration_slice["changes"].shape[0]
-            # calculate correction and apply to the calibration timeseries
-            correction = avg_trend - avg_calibration_slice
-            calibrated_timeseries_list.append(calibration_timeseries["changes"] + correction)
-
-            # Create distance to observation period of the trend within the time grid of the calibration timeseries
-            # note that 1 year is added for the inverse distance calculation,
-            # so that it has a value of 1 when it is within the time period
-            temporal_resolution = calibration_timeseries["start_dates"].iloc[1] - \
-                calibration_timeseries["start_dates"].iloc[0]
-            distance_matrix_list.append([get_distance_to_timeperiod(float(year), longterm_trend['start_dates'],
-                                                                    longterm_trend['end_dates'],
-                                                                    resolution=temporal_resolution) + 1.0
-                                        for year in calibration_timeseries["start_dates"]])
-        else:
-            warnings.warn("Trend is outside calibration timeseries (fully or partly) and will be ignored. "
-                          "trend_start={} , trend_end={}, calibration_series_start={}, calibration_series_end={}"
-                          .format(longterm_trend["start_dates"], longterm_trend["end_dates"],
-                                  min(calibration_timeseries["start_dates"]), max(calibration_timeseries["end_dates"])),
-                          stacklevel=2)
-
-    return np.array(calibrated_timeseries_list), np.array(distance_matrix_list)
+    calibration_start_dates = np.asarray(calibration_timeseries["start_dates"])
+    calibration_end_dates = np.asarray(calibration_timeseries["end_dates"])
+    calibration_changes = np.asarray(calibration_timeseries["changes"], dtype=float)
+    trend_start_dates = np.asarray(trends["start_dates"])
+    trend_end_dates = np.asarray(trends["end_dates"])
+    trend_changes = np.asarray(trends["changes"], dtype=float)
+
+    # make sure that the longterm trends are within the calibration series
+    calibration_series_start, calibration_series_end = calibration_start_dates.min(), calibration_end_dates.max()
+    trend_is_valid = (calibration_series_start <= trend_start_dates) & (calibration_series_end >= trend_end_dates)
+    for trend_index in np.flatnonzero(~trend_is_valid):
+        warnings.warn("Trend is outside calibration timeseries (fully or partly) and will be ignored. "
+                      "trend_start={} , trend_end={}, calibration_series_start={}, calibration_series_end={}"
+                      .format(trend_start_dates[trend_index], trend_end_dates[trend_index],
+                              calibration_series_start, calibration_series_end),
+                      stacklevel=2)
+    trend_start_dates = trend_start_dates[trend_is_valid]
+    trend_end_dates = trend_end_dates[trend_is_valid]
+    trend_changes = trend_changes[trend_is_valid]
+
+    # sums, non-nan counts and lengths of the slices of the high resolution calibration dataset
+    # corresponding to each trend timeperiod, skipping nan values like pandas
+    calibration_changes_not_nan = ~np.isnan(calibration_changes)
+    calibration_changes_nan_as_zero = np.where(calibration_changes_not_nan, calibration_changes, 0.0)
+    if np.all(np.diff(calibration_start_dates) >= 0) and np.all(np.diff(calibration_end_dates) >= 0):
+        # dates are ascending, so each slice is contiguous and can be read off cumulative sums
+        slice_starts = np.searchsorted(calibration_start_dates, trend_start_dates, side="left")
+        slice_ends = np.maximum(np.searchsorted(calibration_end_dates, trend_end_dates, side="right"), slice_starts)
+        cumulative_changes = np.concatenate(([0.0], np.cumsum(calibration_changes_nan_as_zero)))
+        cumulative_counts = np.concatenate(([0], np.cumsum(calibration_changes_not_nan)))
+        slice_sums = cumulative_changes[slice_ends] - cumulative_changes[slice_starts]
+        slice_counts = cumulative_counts[slice_ends] - cumulative_counts[slice_starts]
+        slice_lengths = slice_ends - slice_starts
+    else:
+        calibration_slices = ((calibration_start_dates >= trend_start_dates[:, np.newaxis])
+                              & (calibration_end_dates <= trend_end_dates[:, np.newaxis]))
+        slice_sums = calibration_slices @ calibration_changes_nan_as_zero
+        slice_counts = np.count_nonzero(calibration_slices & calibration_changes_not_nan, axis=1)
+        slice_lengths = calibration_slices.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # average of the high resolution calibration timeseries over shared period
+        avg_calibration_slices = slice_sums / slice_counts
+        # resample to same resolution as the calibration timeseries
+        avg_trends = trend_changes / slice_lengths
+    # calculate correction and apply to the calibration timeseries
+    corrections = avg_trends - avg_calibration_slices
+    calibrated_timeseries = calibration_changes + corrections[:, np.newaxis]
+
+    # Create distance to observation period of the trend within the time grid of the calibration timeseries
+    # note that 1 year is added for the inverse distance calculation,
+    # so that it has a value of 1 when it is within the time period
+    # (broadcast over all trends and calibration dates at once)
+    temporal_resolution = calibration_start_dates[1] - calibration_start_dates[0]
+    distance_matrix = get_distance_to_timeperiod(calibration_start_dates.astype(float),
+                                                 trend_start_dates[:, np.newaxis], trend_end_dates[:, np.newaxis],
+                                                 resolution=temporal_resolution) + 1.0
+
+    return calibrated_timeseries, distance_matrix
 
 
 def combine_calibrated_timeseries(calibrated_series: np.array,
@@ -107,9 +131,16 @@ def combine_calibrated_timeseries(calibrated_series: np.array,
     """
     if p_value > 0:
         # calculate inverse distance weight
-        distance_weight = [(1 / np.array(x))**p_value for x in distance_matrix]
+        with np.errstate(divide="ignore"):
+            distance_weight_perc = np.divide(1.0, distance_matrix)
+        distance_weight_perc **= p_value
+        zero_distance = np.equal(distance_matrix, 0)
+        if zero_distance.any():
+            # the weight of a series at zero distance is infinite, so where there is one it is used exactly
+            zero_distance_columns = zero_distance.any(axis=0)
+            distance_weight_perc[:, zero_distance_columns] = zero_distance[:, zero_distance_columns]
         # convert to percentages
-        distance_weight_perc = np.array(distance_weight) / [sum(x) for x in zip(*distance_weight)]
+        distance_weight_perc /= distance_weight_perc.sum(axis=0)
     else:  # when p-value is zero we only use the exact time periods and no weight left and right of time period
         distance_matrix = distance_matrix.copy()
         distance_matrix[distance_matrix > 1] = 0  # set all distances outside covered time period to 0
@@ -118,7 +149,7 @@ def combine_calibrated_timeseries(calibrated_series: np.array,
             # we just get nan values when this happens (for periods in the calibration dataset that are not covered
             # with any of the calibrated series datasets), This is exactly the behaviour we want in this case.
             warnings.simplefilter("ignore", category=RuntimeWarning)
-            distance_weight_perc = np.array(distance_matrix) / [sum(x) for x in zip(*distance_matrix)]
+            distance_weight_perc = distance_matrix / distance_matrix.sum(axis=0)
 
             if calculate_outside_calibrated_series_period:
                 # now replace NaNs (at start and end of the series) with closest values, so that we include these values
@@ -127,27 +158,29 @@ def combine_calibrated_timeseries(calibrated_series: np.array,
                     mask), np.flatnonzero(~mask), distance_weight_perc[~mask])
 
     # apply distance weight
-    weighted_calibrated_series = np.array(calibrated_series) * np.array(distance_weight_perc)
+    # (the weights are no longer needed, so they are overwritten with the weighted series)
+    weighted_calibrated_series = np.multiply(calibrated_series, distance_weight_perc, out=distance_weight_perc)
     # return sum of all distance weighted series (= mean timeseries)
-    return np.array([sum(x) for x in zip(*weighted_calibrated_series)])
+    return weighted_calibrated_series.sum(axis=0)
 
 
-def get_distance_to_timeperiod(date: float,
-                               period_start_date: float,
-                               period_end_date: float,
-                               resolution: float = 1 / 12) -> float:
+def get_distance_to_timeperiod(date: Union[float, np.ndarray],
+                               period_start_date: Union[float, np.ndarray],
+                               period_end_date: Union[float, np.ndarray],
+                               resolution: float = 1 / 12) -> Union[float, np.ndarray]:
     """
     Calculates the distance to a time period in years for distance weighting.
+    Arrays of dates and periods are broadcast against each other, returning an array of distances.
 
     Parameters
     ----------
-    date : float
+    date : Union[float, np.ndarray]
         date to calculate the distance in fractional years
         date is assumed to be at the start within a time series (and not the middle of a timestep)
         i.e. date is a start_date
-    period_start_date : float
+    period_start_date : Union[float, np.ndarray]
         start of timeperiod in fractional years
-    period_end_date : float
+    period_end_date : Union[float, np.ndarray]
         end of timeperiod in fractional years
     resolution : float, optional
         resolution of date, this is added to all values later than the time period,
@@ -156,12 +189,10 @@ def get_distance_to_timeperiod(date: float,
 
     Returns
     -------
-    float
+    Union[float, np.ndarray]
         Distance to time period in fractional years
     """
-    if date >= period_end_date:
-        return date - period_end_date + resolution  # add an extra data point since we are assuming it is a start_date
-    if date < period_start_date:
-        return period_start_date - date
-    else:
-        return 0.0
+    distance = np.where(date >= period_end_date,
+                        date - period_end_date + resolution,  # add an extra data point since date is a start_date
+                        np.where(date < period_start_date, period_start_date - date, 0.0))
+    return distance if distance.ndim else float(distance)
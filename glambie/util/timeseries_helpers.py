@@ -1,10 +1,6 @@
-import datetime
-import math
 from typing import Iterable, Tuple
 import warnings
 
-from dateutil.relativedelta import relativedelta
-from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
 from scipy import interpolate
@@ -17,6 +13,9 @@ from glambie.const.constants import ExtractTrendsMethod
 def contains_duplicates(x: np.array) -> bool:
     """Checks if an array / list contains duplicate values
     """
+    x = np.asarray(x)
+    if x.ndim == 1 and _is_strictly_increasing(x):  # e.g. date grids, avoids sorting a copy
+        return False
     return len(np.unique(x)) != len(x)
 
 
@@ -54,29 +53,29 @@ def get_matched_indices(array1: np.array, array2: np.array, tolerance: float = 0
         1. The indices at which values in 'array1' match a value in 'array2'
         2. The indices at which values in 'array2' match a value in 'array1'
     """
+    array1, array2 = np.asarray(array1), np.asarray(array2)
+    if tolerance == 0 and _is_strictly_increasing(array1) and _is_strictly_increasing(array2):
+        # sorted arrays without duplicates, e.g. date grids, can be matched with a binary search
+        return _get_matched_indices_sorted(array1, array2)
+
     if contains_duplicates(array1) or contains_duplicates(array2):
         raise ValueError('Input array <array1> or <array2> should not contain duplicates.')
 
+    if tolerance == 0:
+        # exact matches of unique values, returned in ascending order of the matched values
+        _, match_arr1, match_arr2 = np.intersect1d(array1, array2, assume_unique=True, return_indices=True)
+        return match_arr1, match_arr2
+
     length_arr1 = len(array1)
     length_arr2 = len(array2)
-    match_arr1 = np.zeros(array1.shape, dtype=bool)
-    match_arr2 = np.zeros(array2.shape, dtype=bool)
 
     if length_arr1 == 1 or length_arr2 == 1:
         if length_arr2 > 1:
-            match_arr2[:] = (array2 == array1[0])
-            if match_arr2.any():
-                match_arr1 = np.zeros((np.count_nonzero(match_arr2)), dtype=np.int32)
-            else:
-                match_arr1 = np.array([])
-            match_arr2 = np.flatnonzero(match_arr2)
+            match_arr2 = np.flatnonzero(array2 == array1[0])
+            match_arr1 = np.zeros(len(match_arr2), dtype=np.intp)
         else:
-            match_arr1[:] = (array1 == array2[0])
-            if match_arr1.any():
-                match_arr2 = np.zeros((np.count_nonzero(match_arr1)), dtype=np.int32)
-            else:
-                match_arr2 = np.array([])
-            match_arr1 = np.flatnonzero(match_arr1)
+            match_arr1 = np.flatnonzero(array1 == array2[0])
+            match_arr2 = np.zeros(len(match_arr1), dtype=np.intp)
         return match_arr1, match_arr2
     concat_arr = np.concatenate((array1, array2))
     ind = np.concatenate(
@@ -92,33 +91,37 @@ def get_matched_indices(array1: np.array, array2: np.array, tolerance: float = 0
     ind = ind[sub]
     vec = vec[sub]
 
-    if tolerance == 0:
-        firstdup = np.logical_and(
-            concat_arr == np.roll(concat_arr, -1),
-            vec != np.roll(vec, -1)
-        )
-    else:
-        firstdup = np.logical_and(
-            np.abs(concat_arr - np.roll(concat_arr, -1)) < tolerance,
-            vec != np.roll(vec, -1)
-        )
-    count = np.count_nonzero(firstdup)
-    firstdup = np.flatnonzero(firstdup)
+    # neighbouring values from different arrays that are within the tolerance of each other
+    firstdup = np.flatnonzero(np.logical_and(
+        np.abs(concat_arr[:-1] - concat_arr[1:]) < tolerance,
+        vec[:-1] != vec[1:]
+    ))
+    count = len(firstdup)
     if count == 0:
-        match_arr1 = np.array([])
-        match_arr2 = np.array([])
-        return match_arr1, match_arr2
-    dup = np.zeros((count * 2), dtype=int)
-    even = np.arange(count) * 2
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    # each pair consists of one value from each array, check which of the two is from 'array2'
+    left_is_from_arr2 = vec[firstdup]
+    match_arr2 = np.where(left_is_from_arr2, ind[firstdup], ind[firstdup + 1])
+    match_arr1 = np.where(left_is_from_arr2, ind[firstdup + 1], ind[firstdup])
+    return match_arr1, match_arr2
 
-    dup[even] = firstdup
-    dup[even + 1] = firstdup + 1
 
-    ind = ind[dup]
-    vec = vec[dup]
-    match_arr2 = ind[vec]
-    match_arr1 = ind[np.logical_not(vec)]
-    return match_arr1, match_arr2
+def _is_strictly_increasing(x: np.array) -> bool:
+    """Checks if each value of an array is larger than the previous one, i.e. it is sorted and free of duplicates
+    """
+    x = np.asarray(x)
+    return bool(np.all(x[1:] > x[:-1]))
+
+
+def _get_matched_indices_sorted(sorted_array1: np.array, array2: np.array) -> Tuple[np.array, np.array]:
+    """
+    Same as get_matched_indices with a tolerance of 0, for when 'sorted_array1' is sorted in ascending order
+    and both arrays contain no duplicates. Uses a binary search rather than sorting both arrays together.
+    """
+    matched_indices_1 = np.searchsorted(sorted_array1, array2)
+    is_matched = matched_indices_1 < len(sorted_array1)
+    is_matched[is_matched] = sorted_array1[matched_indices_1[is_matched]] == array2[is_matched]
+    return matched_indices_1[is_matched], np.flatnonzero(is_matched)
 
 
 def resample_1d_array(x: np.array, y: np.array, x_new: np.array, mode: str = "linear") -> np.array:
@@ -146,11 +149,11 @@ def resample_1d_array(x: np.array, y: np.array, x_new: np.array, mode: str = "li
     ValueError
         if mode not recognised
     """
-    if mode == "spline":
+    if mode == "linear":  # default, used when combining timeseries
+        ynew = np.interp(x_new, x, y)
+    elif mode == "spline":
         s = interpolate.InterpolatedUnivariateSpline(x, y)
         ynew = s(x_new)
-    elif mode == "linear":
-        ynew = np.interp(x_new, x, y)
     elif mode == "nearest":
         s = interpolate.interp1d(x, y, kind='nearest', fill_value="extrapolate")
         ynew = s(x_new)
@@ -189,18 +192,23 @@ def moving_average(dx: float, x: np.array, y: np.array = None, clip: bool = Fals
         ry = np.empty(n,)
         ry.fill(np.nan)
 
-        for i in range(n):
-            ok = np.logical_and(
-                x > x[i] - dx / 2.,
-                x < x[i] + dx / 2.)
-            if ok.any():
-                ry[i] = np.mean(y[ok])
+        x_is_sorted = np.all(x[1:] >= x[:-1])
+        if x_is_sorted:
+            # for sorted x each window is a contiguous slice, so find all window bounds at once
+            window_starts = np.searchsorted(x, x - dx / 2., side='right')
+            window_ends = np.searchsorted(x, x + dx / 2., side='left')
+            for i in np.flatnonzero(window_ends > window_starts):
+                ry[i] = np.mean(y[window_starts[i]:window_ends[i]])
+        else:
+            for i in range(n):
+                ok = np.logical_and(
+                    x > x[i] - dx / 2.,
+                    x < x[i] + dx / 2.)
+                if ok.any():
+                    ry[i] = np.mean(y[ok])
         if clip:
-            ok = np.logical_or(
-                x < np.min(x) + dx / 2 - 1,
-                x > np.max(x) - dx / 2 + 1)
-            if ok.any():
-                ry[ok] = np.nan
+            x_min, x_max = (x[0], x[-1]) if x_is_sorted else (np.min(x), np.max(x))
+            ry[(x < x_min + dx / 2 - 1) | (x > x_max - dx / 2 + 1)] = np.nan
         return ry
     else:
         result = np.cumsum(x, dtype=x.dtype)
@@ -231,12 +239,15 @@ def timeseries_as_months(fractional_year_array: np.array, downsample_to_month: b
         the new monthly array of fractional years
     """
     if downsample_to_month:
-        t0 = math.floor(np.min(fractional_year_array) * 12) / 12.
-        t1 = math.ceil(np.max(fractional_year_array) * 12) / 12.
+        t0 = np.floor(np.min(fractional_year_array) * 12) / 12.
+        t1 = np.ceil(np.max(fractional_year_array) * 12) / 12.
         # small hack to include last element in case it's on a full integer number
-        monthly_array = np.arange(math.ceil((t1 - t0 + 0.00001) * 12)) / 12. + t0
+        monthly_array = np.arange(np.ceil((t1 - t0 + 0.00001) * 12)) / 12. + t0
     else:  # we add half a month (1/24) to fractional year so it's not always rounded down
-        monthly_array = np.floor((np.array(fractional_year_array) + (1 / 24)) * 12) / 12.
+        monthly_array = np.asarray(fractional_year_array) + (1 / 24)
+        monthly_array *= 12
+        np.floor(monthly_array, out=monthly_array)
+        monthly_array /= 12.
 
     if contains_duplicates(monthly_array):
         warnings.warn("The rounded dates contain duplicates. "
@@ -264,11 +275,12 @@ def timeseries_is_monthly_grid(fractional_year_array: np.array) -> bool:
     with warnings.catch_warnings():  # ignore warning about duplicates
         warnings.simplefilter("ignore")
         monthly_grid = timeseries_as_months(fractional_year_array, downsample_to_month=False)
-    try:
-        np.testing.assert_almost_equal(monthly_grid, fractional_year_array)
-    except AssertionError:
-        return False
-    return True
+    fractional_year_array = np.asarray(fractional_year_array)
+    # same criterion as np.testing.assert_almost_equal (7 decimals), treating nan and inf at the same place as equal
+    with np.errstate(invalid="ignore"):
+        is_on_grid = np.abs(monthly_grid - fractional_year_array) < 1.5e-7
+    is_on_grid |= (monthly_grid == fractional_year_array) | (np.isnan(monthly_grid) & np.isnan(fractional_year_array))
+    return bool(is_on_grid.all())
 
 
 def combine_timeseries_imbie(t_array: list[np.ndarray],
@@ -308,46 +320,51 @@ def combine_timeseries_imbie(t_array: list[np.ndarray],
 
     colors = ['r', 'g', 'b', 'c', 'y', 'm', 'o', 'k']  # n.b. this assumes we have no more than 8 solutions
     if verbose:
+        # only import matplotlib when plotting, as it is slow to import
+        from matplotlib import pyplot as plt
         for t_solution, y_solution, c in zip(t_array, y_array, colors[1:]):
             plt.plot(t_solution, y_solution, c + '-')
-    # create solution_indices array, which indicates which input array each element originated from
-    solution_indices = [np.ones(ti.shape, dtype=int) * (i + 1) for i, ti in enumerate(t_array)]
-    solution_indices = np.concatenate(solution_indices)
-    # chain together input sequences, solution_indices describes
+    # solution_bounds marks where each input array starts and ends within the concatenated arrays
+    number_of_solutions = len(t_array)
+    solution_bounds = np.cumsum([0] + [len(ti) for ti in t_array])
+    # chain together input sequences
     t_array = np.concatenate(t_array)
     y_array = np.concatenate(y_array)
-    # sort the input time-values, and interpolate them to monthly values, this will be the output time domain
-    t_array_combined = timeseries_as_months(np.sort(t_array))
-    # remove duplicates from where inputs have overlapped
-    t_array_combined = np.unique(t_array_combined)
-    # create output array to be filled
-    y_array_combined = np.zeros(t_array_combined.shape, dtype=t_array_combined.dtype)
-    # solutions_per_timestep is used to count the number of input data points that have been used for each output point
-    solutions_per_timestep = np.zeros(t_array_combined.shape, dtype=t_array_combined.dtype)
-
-    # create data_out array for resampled data input
+    # interpolate the input time-values to monthly values, this will be the output time domain
+    # (the monthly grid spans the earliest to the latest input time, so it is sorted and free of duplicates)
+    t_array_combined = timeseries_as_months(t_array)
+    # integer month keys of the output time domain, for matching the resampled solutions
+    t_array_combined_months = np.floor(t_array_combined * 12).astype(np.int64)
+    # create data_out array for resampled data input, one row per solution
     full_resampled_data = np.empty(
-        (len(t_array_combined), np.max(solution_indices) + 1),
+        (number_of_solutions + 1, len(t_array_combined)),
         dtype=t_array_combined.dtype
     )
     full_resampled_data.fill(np.nan)  # initially all values to NaN
-    full_resampled_data[:, 0] = t_array_combined  # fill in time domain
+    full_resampled_data[0] = t_array_combined  # fill in time domain
 
-    #  RESAMPLE ALL SOLUTIONS TO MONTHLY AND SUM UP SOLUTIONS in y_array_combined
-    for index_of_solution in range(1, np.max(solution_indices) + 1):  # iterate through each solution
-        # Find valid indices for solution in concatenated array
-        valid_indices = np.logical_and(solution_indices == index_of_solution, np.isfinite(y_array))
+    if outlier_tolerance is not None:
+        # mean and spread of all input values, used to eliminate outliers from each solution
+        y_array_mean = np.nanmean(y_array)
+        outlier_threshold = max(outlier_tolerance, 1) * np.nanstd(y_array)
+
+    #  RESAMPLE ALL SOLUTIONS TO MONTHLY
+    for index_of_solution in range(1, number_of_solutions + 1):  # iterate through each solution
+        # Get values for current solution from concatenated arrays and find its valid indices
+        solution_start, solution_end = solution_bounds[index_of_solution - 1], solution_bounds[index_of_solution]
+        t_solution = t_array[solution_start:solution_end]
+        y_solution = y_array[solution_start:solution_end]
+        valid_indices = np.isfinite(y_solution)
 
         # if outlier_tolerance has been specified, eliminate values far from the mean
         if outlier_tolerance is not None:
-            valid_indices[valid_indices] = np.abs(y_array[valid_indices] - np.nanmean(y_array)) \
-                < max(outlier_tolerance, 1) * np.nanstd(y_array)
+            valid_indices[valid_indices] = np.abs(y_solution[valid_indices] - y_array_mean) < outlier_threshold
         # if we've eliminated all values in the current input, skip to the next solution.
         if not valid_indices.any():
             continue
-        # Filter concatenated y_array and t_array by solution, so get values for current solution
-        t_solution = t_array[valid_indices]
-        y_solution = y_array[valid_indices]
+        # Filter by valid indices
+        t_solution = t_solution[valid_indices]
+        y_solution = y_solution[valid_indices]
         # sort by time
         sort = np.argsort(t_solution)
         t_solution = t_solution[sort]
@@ -357,33 +374,29 @@ def combine_timeseries_imbie(t_array: list[np.ndarray],
         # use interpolation to find y-values at the new times
         y_solution_resampled = resample_1d_array(t_solution, y_solution, t_solution_resampled)
         # find locations where the times match the times of the combined series
-        matched_indices_1, matched_indices_2 = get_matched_indices(np.floor(t_array_combined * 12),
-                                                                   np.floor(t_solution_resampled * 12))
+        matched_indices_1, matched_indices_2 = _get_matched_indices_sorted(
+            t_array_combined_months, np.floor(t_solution_resampled * 12).astype(np.int64))
         if verbose:
             plt.plot(t_solution_resampled, y_solution_resampled, colors[index_of_solution] + '.',
                      label='solution: {}'.format(index_of_solution))
-        # add the values from the current input seq. to the output seq.
-        if calculate_as_errors:
-            y_array_combined[matched_indices_1] += y_solution_resampled[matched_indices_2] ** 2.
-        else:
-            y_array_combined[matched_indices_1] += y_solution_resampled[matched_indices_2]
-        full_resampled_data[matched_indices_1, index_of_solution] = y_solution_resampled[matched_indices_2]
-        # increment the values in solutions_per_timestep for each current point
-        solutions_per_timestep[matched_indices_1] += 1
+        full_resampled_data[index_of_solution, matched_indices_1] = y_solution_resampled[matched_indices_2]
+
+    # SUM UP SOLUTIONS in y_array_combined, summing over rows adds the solutions in order
+    resampled_solutions = full_resampled_data[1:]
+    solution_is_missing = np.isnan(resampled_solutions)
+    if calculate_as_errors:
+        resampled_solutions = resampled_solutions ** 2.
+    y_array_combined = np.where(solution_is_missing, 0., resampled_solutions).sum(axis=0)
+    # solutions_per_timestep is the number of input data points that have been used for each output point
+    solutions_per_timestep = np.count_nonzero(~solution_is_missing, axis=0)
 
     # DIVIDE SUMMED RESULT BY NUMBER OF SOLUTIONS TO GET AVERAGE
-    # set any zeros in solutions_per_timestep to ones so we don't run into divide by 0 errors
-    solutions_per_timestep_ = np.maximum(solutions_per_timestep, np.ones(solutions_per_timestep.shape))
-    # use solutions_per_timestep_ to calculate the element-wise average of the data
     if calculate_as_errors:
-        y_array_combined = np.sqrt(y_array_combined / solutions_per_timestep_) / np.sqrt(solutions_per_timestep_)
-    else:
-        y_array_combined /= solutions_per_timestep_
-    # find any locations where no values were found
-    valid_indices = (solutions_per_timestep == 0)
-    # set those locations to NaNs
-    if valid_indices.any():
-        y_array_combined[valid_indices] = np.nan
+        # root of the summed squares divided by the number of solutions, sqrt(sum / n) / sqrt(n) = sqrt(sum) / n
+        np.sqrt(y_array_combined, out=y_array_combined)
+    # only divide where solutions were found, any locations where no values were found are left as NaNs
+    y_array_combined = np.divide(y_array_combined, solutions_per_timestep,
+                                 out=np.full_like(y_array_combined, np.nan), where=solutions_per_timestep != 0)
 
     # PERFORM ADDITIONAL OPTIONAL EDITS ON RESULT
     if verbose:  # optionally plot output
@@ -392,13 +405,25 @@ def combine_timeseries_imbie(t_array: list[np.ndarray],
         y_array_combined = moving_average(13. / 12, t_array_combined, y_array_combined)
         if verbose:
             plt.plot(t_array_combined, y_array_combined, '--k', color='grey', label='comb. moving avg')
-    full_resampled_data = full_resampled_data.T
     if verbose:
         plt.legend()
         plt.show()
     return t_array_combined, y_array_combined, full_resampled_data
 
 
+def _cumsum_skipping_nan(x: np.array) -> np.array:
+    """Cumulative sum which skips nan (or None) values like pandas, i.e. they stay nan without breaking the sum
+    """
+    x = np.asarray(x)
+    if x.dtype.kind not in "iu":  # integers can't be nan, anything else is summed as floats
+        x = x.astype(float)
+    cumulative_sum = np.nancumsum(x)
+    is_nan = np.isnan(x)
+    if is_nan.any():
+        cumulative_sum[is_nan] = np.nan
+    return cumulative_sum
+
+
 def derivative_to_cumulative(start_dates: list[float],
                              end_dates: list[float],
                              changes: list[float],
@@ -437,9 +462,9 @@ def derivative_to_cumulative(start_dates: list[float],
     # add an extra row to dataset for each gap, so that it's represented in the cumulative timeseries as no data
 
     if calculate_as_errors:
-        changes = [0, *np.array(pd.Series(np.square(changes)).cumsum())**0.5]
+        changes = [0, *_cumsum_skipping_nan(np.square(changes))**0.5]
     else:
-        changes = [0, *np.array(pd.Series(changes).cumsum())]
+        changes = [0, *_cumsum_skipping_nan(changes)]
 
     if not all(contains_no_gaps) and add_gaps_for_plotting:
         indices_of_gaps = [i for i, x in enumerate(contains_no_gaps) if not (x)]
@@ -490,12 +515,13 @@ def cumulative_to_derivative(fractional_year_array, cumulative_changes, return_t
         'arrays': (start_dates, end_dates, changes)
         'dataframe': pd.DataFrame({'start_dates': start_dates, 'end_dates': end_dates, 'changes': changes})
     """
-    # remove first row
-    derivative = np.array(pd.Series(cumulative_changes).diff().iloc[1:])
+    # difference to previous row, so one element shorter
+    derivative = np.diff(np.asarray(cumulative_changes, dtype=float))
+    fractional_year_array = np.asarray(fractional_year_array)
     # remove last row for start dates
-    start_dates = np.array(pd.Series(fractional_year_array).iloc[:-1])
+    start_dates = fractional_year_array[:-1].copy()
     # remove first row for end dates
-    end_dates = np.array(pd.Series(fractional_year_array).iloc[1:])
+    end_dates = fractional_year_array[1:].copy()
 
     if return_type == "arrays":
         return start_dates, end_dates, derivative
@@ -630,12 +656,20 @@ def get_average_trends_over_new_time_periods(start_dates, end_dates, changes, ne
         warnings.warn("New end dates should be values in timeseries end_dates."
                       "Result may be invalid.", stacklevel=2)
 
-    timeseries_df = pd.DataFrame({"start_dates": start_dates, "end_dates": end_dates, "changes": changes})
+    start_dates, end_dates, changes = np.asarray(start_dates), np.asarray(end_dates), np.asarray(changes)
+    if np.all(start_dates[1:] >= start_dates[:-1]) and np.all(end_dates[1:] >= end_dates[:-1]):
+        # dates are ascending, so the timesteps within each new time period are a contiguous slice
+        slice_starts = np.searchsorted(start_dates, new_start_dates, side="left")
+        slice_ends = np.searchsorted(end_dates, new_end_dates, side="right")
+        timesteps_per_period = [slice(slice_start, max(slice_start, slice_end))
+                                for slice_start, slice_end in zip(slice_starts, slice_ends)]
+    else:
+        timesteps_per_period = [(start_dates >= start_date) & (end_dates <= end_date)
+                                for start_date, end_date in zip(new_start_dates, new_end_dates)]
     annual_changes = []
-    for start_date, end_date in zip(new_start_dates, new_end_dates):
-        df_sub = timeseries_df[(timeseries_df["start_dates"] >= start_date) & (timeseries_df["end_dates"] <= end_date)]
-        annual_changes.append(get_total_trend(df_sub["start_dates"],
-                              df_sub["end_dates"], df_sub["changes"], return_type="value",
+    for timesteps in timesteps_per_period:
+        annual_changes.append(get_total_trend(start_dates[timesteps],
+                              end_dates[timesteps], changes[timesteps], return_type="value",
                               calculate_as_errors=calculate_as_errors))
 
     return pd.DataFrame({"start_dates": new_start_dates,
@@ -686,11 +720,10 @@ def interpolate_change_per_day_to_fill_gaps(elevation_time_series: pd.DataFrame)
     """
 
     # Calculate the gaps between end dates and subsequent start dates in original time series
-    start_dates = [datetime.datetime.strptime(a, '%d/%m/%Y') for a in elevation_time_series.start_date]
-    end_dates = [datetime.datetime.strptime(a, '%d/%m/%Y') for a in elevation_time_series.end_date]
+    start_dates = pd.to_datetime(elevation_time_series.start_date, format='%d/%m/%Y', cache=True).to_numpy()
+    end_dates = pd.to_datetime(elevation_time_series.end_date, format='%d/%m/%Y', cache=True).to_numpy()
 
-    date_gap_in_days_between_entries = [
-        (start_dates[i + 1] - end_dates[i]).days for i in range(len(elevation_time_series) - 1)]
+    date_gap_in_days_between_entries = (start_dates[1:] - end_dates[:-1]).astype('timedelta64[D]').astype(int)
     elevation_time_series['date_gap_days'] = np.append(date_gap_in_days_between_entries, [0])
 
     date_gaps_indexes = np.where(elevation_time_series['date_gap_days'] > 1)[0]
@@ -699,18 +732,20 @@ def interpolate_change_per_day_to_fill_gaps(elevation_time_series: pd.DataFrame)
                        'hydrological_correction_value', 'sea_level_correction_value']
     interpolated_dataframe = interpolated_dataframe[columns_to_keep]
 
-    for date_gap_index in date_gaps_indexes:
-        interpolated_dataframe.loc[date_gap_index + 0.5] = [
-            datetime.strftime(end_dates[date_gap_index] + relativedelta(days=1), '%d/%m/%Y'),
-            datetime.strftime(start_dates[date_gap_index + 1] - relativedelta(days=1), '%d/%m/%Y'),
-            np.nan, np.nan, np.nan, np.nan]
+    if len(date_gaps_indexes) > 0:
+        # add an empty row covering each gap, placed between the entries either side of it
+        one_day = np.timedelta64(1, 'D')
+        gaps_dataframe = pd.DataFrame(np.nan, index=date_gaps_indexes + 0.5, columns=columns_to_keep)
+        gaps_dataframe['start_date'] = pd.DatetimeIndex(end_dates[date_gaps_indexes] + one_day).strftime('%d/%m/%Y')
+        gaps_dataframe['end_date'] = pd.DatetimeIndex(start_dates[date_gaps_indexes + 1] - one_day).strftime(
+            '%d/%m/%Y')
+        interpolated_dataframe = pd.concat([interpolated_dataframe, gaps_dataframe])
     interpolated_dataframe = interpolated_dataframe.sort_index().reset_index(drop=True)
 
     # calculate days covered by each row
-    number_of_days_covered_by_each_row = [
-        (datetime.strptime(interpolated_dataframe['end_date'][i], '%d/%m/%Y') - datetime.strptime(
-            interpolated_dataframe['start_date'][i], '%d/%m/%Y')).days for i in range(len(interpolated_dataframe))]
-    interpolated_dataframe['days_covered'] = number_of_days_covered_by_each_row
+    interpolated_start_dates = pd.to_datetime(interpolated_dataframe['start_date'], format='%d/%m/%Y', cache=True)
+    interpolated_end_dates = pd.to_datetime(interpolated_dataframe['end_date'], format='%d/%m/%Y', cache=True)
+    interpolated_dataframe['days_covered'] = (interpolated_end_dates - interpolated_start_dates).dt.days
 
     # calculate change per day in each row
     interpolated_dataframe['glacier_change_per_day'] \
@@ -718,8 +753,8 @@ def interpolate_change_per_day_to_fill_gaps(elevation_time_series: pd.DataFrame)
     interpolated_dataframe['glacier_change_uncertainty_per_day'] \
         = interpolated_dataframe.glacier_change_uncertainty / interpolated_dataframe.days_covered
 
-    interpolated_dataframe['date_fractional'] = datetime_dates_to_fractional_years([datetime.strptime(
-        interpolated_dataframe['start_date'][i], '%d/%m/%Y') for i in range(len(interpolated_dataframe))])
+    interpolated_dataframe['date_fractional'] = datetime_dates_to_fractional_years(
+        interpolated_start_dates.to_numpy())
 
     # Linear interpolation of glacier_change_per_day to fill gaps
     for column_name in ['glacier_change_per_day', 'glacier_change_uncertainty_per_day', 'hydrological_correction_value',
@@ -422,7 +422,7 @@ def test_apply_area_change_convert_to_gt_equals_same(example_timeseries_ingested
     adjusted_area = glacier_area + (t_i - t_0) * (area_change / 100) * glacier_area
     gt_area_c = meters_water_equivalent_to_gigatonnes([timeseries_area_change.data.changes[0]], area_km2=adjusted_area)
     # this should now give the same result in Gt
-    assert gt_no_area_c == gt_area_c
+    assert np.allclose(gt_no_area_c, gt_area_c)
 
 
 def test_apply_area_change_and_remove(example_timeseries_ingested):
@@ -3,6 +3,8 @@ from glambie.processing.processing_helpers import recombine_split_timeseries_in_
 from glambie.processing.processing_helpers import slice_timeseries_at_gaps
 from glambie.processing.processing_helpers import check_and_handle_gaps_in_timeseries
 from glambie.processing.processing_helpers import extend_annual_timeseries_if_shorter_than_time_window
+from glambie.processing.processing_helpers import set_unneeded_columns_to_nan
+from glambie.processing.processing_helpers import get_reduced_catalogue_to_date_window
 from glambie.const.data_groups import GLAMBIE_DATA_GROUPS
 from glambie.data.data_catalogue import DataCatalogue
 from glambie.data.timeseries import TimeseriesData, Timeseries
@@ -190,6 +192,25 @@ def test_filter_catalogue_with_config_settings_with_added_combined_dataset_to_tr
     assert not any(d.user_group == "hello_kitty_#" for d in datasets_annual.datasets)
 
 
+def test_filter_catalogue_with_config_settings_with_added_combined_dataset_to_both(
+        example_catalogue_2, glambie_config):
+    data_group = GLAMBIE_DATA_GROUPS["demdiff_and_glaciological"]
+    data_catalogue = example_catalogue_2
+    region_config = glambie_config.regions[1]
+    # include a combined dataset in both annual and trends
+    region_config.region_run_settings[data_group.name]["include_combined_annual_datasets"] = ["hello_kitty"]
+    region_config.region_run_settings[data_group.name]["include_combined_trend_datasets"] = ["hello_kitty"]
+
+    datasets_annual, datasets_trend = filter_catalogue_with_config_settings(
+        data_group=data_group, region_config=region_config, data_catalogue=data_catalogue)
+
+    # asterix should only be added once
+    assert any(d.user_group == "hello_kitty_#" for d in datasets_annual.datasets)
+    assert any(d.user_group == "hello_kitty_#" for d in datasets_trend.datasets)
+    # input catalogue should not have been renamed
+    assert any(d.user_group == "hello_kitty" for d in data_catalogue.datasets)
+
+
 def test_slice_timeseries_at_gaps():
     ts = pd.DataFrame({"start_dates": [2012, 2013, 2015, 2016, 2020],
                        "end_dates": [2013, 2014, 2016, 2017, 2023],
@@ -243,6 +264,12 @@ def test_recombine_split_timeseries(example_catalogue_filled):
                           example_catalogue_filled.datasets[1].data.end_dates)
 
 
+def test_recombine_split_timeseries_with_missing_dataset(example_catalogue_filled):
+    with pytest.raises(KeyError):
+        recombine_split_timeseries_in_catalogue(data_catalogue=example_catalogue_filled,
+                                                names_of_split_datasets_in_catalogue=[["b_1", "b_2"]])
+
+
 def test_extend_annual_timeseries_if_shorter_than_time_window(example_catalogue_filled):
     example_timeseries_ingested = example_catalogue_filled.datasets[1]
 
@@ -265,3 +292,40 @@ def test_extend_annual_timeseries_if_shorter_than_time_window(example_catalogue_
     assert extended_timeseries.data.min_start_date == desired_time_window[0]
     assert extended_timeseries.data.max_end_date == desired_time_window[1]
     assert np.array_equal(extended_timeseries.data.start_dates, timeseries_for_extension.data.start_dates)
+
+
+def test_set_unneeded_columns_to_nan(example_catalogue_filled):
+    result_catalogue = set_unneeded_columns_to_nan(example_catalogue_filled)
+    for dataset in result_catalogue.datasets:
+        assert dataset.data.glacier_area_observed is None
+        assert dataset.data.glacier_area_reference is None
+    # input catalogue is left untouched
+    assert example_catalogue_filled.datasets[0].data.glacier_area_observed is not None
+
+
+def test_set_unneeded_columns_to_nan_inplace(example_catalogue_filled):
+    result_catalogue = set_unneeded_columns_to_nan(example_catalogue_filled, inplace=True)
+    assert result_catalogue is example_catalogue_filled
+    for dataset in example_catalogue_filled.datasets:
+        assert dataset.data.glacier_area_observed is None
+        assert dataset.data.glacier_area_reference is None
+
+
+def test_get_reduced_catalogue_to_date_window(example_catalogue_filled):
+    # the area columns of the first fixture dataset don't match its length, so they are dropped here
+    example_catalogue_filled.datasets[0].data.glacier_area_reference = None
+    example_catalogue_filled.datasets[0].data.glacier_area_observed = None
+    reduced_catalogue = get_reduced_catalogue_to_date_window(example_catalogue_filled, start_date=2010, end_date=2012)
+    # first dataset is reduced, second dataset is already within the window
+    assert np.array_equal(reduced_catalogue.datasets[0].data.start_dates, [2010, 2011])
+    # a dataset already within the window is still a reduced copy, the same as reducing it directly
+    dataset_within_window = example_catalogue_filled.datasets[1]
+    expected = dataset_within_window.reduce_to_date_window(start_date=2010, end_date=2012)
+    assert reduced_catalogue.datasets[1] is not dataset_within_window
+    assert reduced_catalogue.datasets[1].data.as_dataframe().equals(expected.data.as_dataframe())
+    assert reduced_catalogue.datasets[1].data.glacier_area_reference is None
+
+    reduced_catalogue = get_reduced_catalogue_to_date_window(example_catalogue_filled, start_date=2010, end_date=2011,
+                                                             date_window_is_gap=True)
+    assert np.array_equal(reduced_catalogue.datasets[0].data.start_dates, [2011, 2012])
+    assert np.array_equal(reduced_catalogue.datasets[1].data.start_dates, [2011])
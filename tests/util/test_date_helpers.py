@@ -1,4 +1,6 @@
 import datetime
+import pandas as pd
+import pytest
 
 from glambie.util.date_helpers import datetime2year, get_years
 from glambie.util.date_helpers import datetime_dates_to_fractional_years
@@ -43,6 +45,13 @@ def test_datetime_dates_to_fractional_years():
     assert datetime_dates_to_fractional_years(date_list) == [2000.0, 2001.0]
 
 
+def test_datetime_dates_to_fractional_years_accepts_datetime64():
+    date_list = [datetime.datetime(2000, 7, 1), datetime.datetime(2001, 3, 15, 12)]
+    parsed_dates = pd.to_datetime(["01/07/2000 00:00", "15/03/2001 12:00"], format="%d/%m/%Y %H:%M")
+    assert datetime_dates_to_fractional_years(parsed_dates.to_numpy()) == datetime_dates_to_fractional_years(date_list)
+    assert datetime_dates_to_fractional_years(parsed_dates) == datetime_dates_to_fractional_years(date_list)
+
+
 def test_get_glaciological_years():
     min_date = 2009.5
     max_date = 2010.8
@@ -66,3 +75,8 @@ def test_get_glaciological_years_southern_hemisphere():
     assert end_dates[0] == 2011 + 0.25
     assert start_dates[-1] == 2014 + 0.25
     assert end_dates[-1] == 2015 + 0.25
+
+
+def test_get_years_unknown_return_type():
+    with pytest.raises(ValueError):
+        get_years(0.0, min_date=2010, max_date=2012, return_type="list")
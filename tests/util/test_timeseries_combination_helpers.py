@@ -54,6 +54,12 @@ def test_get_distance_to_timeperiod():
                                       period_end_date=period_end_date, resolution=1) == 1.0
 
 
+def test_get_distance_to_timeperiod_array():
+    dates = np.array([1999.0, 2000.0, 2001.0, 2005.0])
+    distances = get_distance_to_timeperiod(date=dates, period_start_date=2000.0, period_end_date=2005.0, resolution=1)
+    assert np.array_equal(distances, np.array([1.0, 0.0, 0.0, 1.0]))
+
+
 def test_calibrate_timeseries_with_trends(example_trends, example_calibration_timeseries):
     calibrated_ts, distance_matrix = calibrate_timeseries_with_trends(example_trends, example_calibration_timeseries)
     # sum of overalapping period should correspond to the trend
@@ -88,6 +94,16 @@ def test_combine_calibrated_timeseries(example_calibrated_series, example_distan
     assert abs(1.0 - calibrated_mean_series[0]) < abs(2.0 - calibrated_mean_series[1])
 
 
+def test_combine_calibrated_timeseries_zero_distance(example_calibrated_series, example_distance_matrix):
+    distance_matrix = example_distance_matrix - 1  # distances of 0 within the time period of each trend
+    distance_matrix[1, 1] = 0
+    calibrated_series = combine_calibrated_timeseries(example_calibrated_series, distance_matrix, p_value=2)
+    assert not np.isnan(calibrated_series).any()
+    # where only one series is at zero distance it is used exactly, where both are they are averaged
+    assert np.array_equal(calibrated_series[[0, 2, 3, 4]], example_calibrated_series[[0, 1, 1, 1], [0, 2, 3, 4]])
+    assert calibrated_series[1] == np.mean(example_calibrated_series[:, 1])
+
+
 def test_combine_calibrated_timeseries_p_value_0(example_calibrated_series, example_distance_matrix):
     p_value = 0
     calibrated_series = combine_calibrated_timeseries(
@@ -10,6 +10,7 @@ from glambie.util.timeseries_helpers import get_total_trend
 from glambie.util.timeseries_helpers import timeseries_is_monthly_grid
 from glambie.util.timeseries_helpers import get_average_trends_over_new_time_periods
 from glambie.util.timeseries_helpers import get_slope_of_timeseries_with_linear_regression
+from glambie.util.timeseries_helpers import interpolate_change_per_day_to_fill_gaps
 from glambie.const.constants import ExtractTrendsMethod
 
 
@@ -97,6 +98,37 @@ def test_get_matched_indices():
     assert np.array_equal(a[ai], b[bi])
 
 
+def test_get_matched_indices_no_matches():
+    a = np.array([3.0, 5.0])
+    b = np.array([4.0])
+    for tolerance in (0.0, 0.5):
+        ai, bi = get_matched_indices(a, b, tolerance=tolerance)
+        assert len(ai) == len(bi) == 0
+        # empty results can still be used to index the inputs
+        assert len(a[ai]) == len(b[bi]) == 0
+
+
+def test_get_matched_indices_lists():
+    ai, bi = get_matched_indices([1, 2, 3], [2, 3], 0)
+    assert np.array_equal(ai, np.array([1, 2]))
+    assert np.array_equal(bi, np.array([0, 1]))
+    ai, bi = get_matched_indices([1.0, 2.0], [2.0], 0.5)
+    assert np.array_equal(ai, np.array([1]))
+    assert np.array_equal(bi, np.array([0]))
+
+
+def test_combine_timeseries_imbie_partially_overlapping():
+    # each solution is matched to the months of the combined timeseries that it covers
+    t = [np.array([2010, 2010 + 1 / 12, 2010 + 2 / 12]), np.array([2010 + 1 / 12, 2010 + 2 / 12, 2010 + 3 / 12])]
+    y = [np.array([1., 2., 3.]), np.array([5., 6., 7.])]
+    t_combined, y_combined, data = combine_timeseries_imbie(t, y, outlier_tolerance=None, calculate_as_errors=False,
+                                                            perform_moving_average=False, verbose=False)
+    assert len(t_combined) == 4
+    assert np.allclose(data[1], [1., 2., 3., np.nan], equal_nan=True)
+    assert np.allclose(data[2], [np.nan, 5., 6., 7.], equal_nan=True)
+    assert np.allclose(y_combined, [1., 3.5, 4.5, 7.])
+
+
 def test_get_matched_indices_with_duplicates():
     a = np.array([3, 5, 5, 9, 11])
     b = np.array([5, 6, 7, 8, 9, 10])
@@ -279,6 +311,14 @@ def test_get_average_trends_over_new_time_periods():
     assert np.array_equal(np.array(trends2["end_dates"]), np.array(end_dates))
 
 
+def test_get_average_trends_over_new_time_periods_unsorted():
+    start_dates = [2012, 2010, 2011]
+    end_dates = [2013, 2011, 2012]
+    changes = [2., 3., 1.]
+    trends = get_average_trends_over_new_time_periods(start_dates, end_dates, changes, [2010, 2011], [2012, 2013])
+    assert np.array_equal(np.array(trends["changes"]), np.array([4., 3.]))
+
+
 def test_get_average_trends_over_new_time_periods_raises_warning():
     start_dates = [2010, 2011, 2012]
     end_dates = [2011, 2012, 2013]
@@ -310,3 +350,19 @@ def test_get_slope_of_timeseries_with_linear_regression():
     changes = [1., 2.5, 4.]
     slope, _ = get_slope_of_timeseries_with_linear_regression(dates, changes)
     assert slope == 3.0
+
+
+def test_interpolate_change_per_day_to_fill_gaps():
+    elevation_time_series = pd.DataFrame({
+        "start_date": ["01/01/2010", "01/02/2010", "01/05/2010"],
+        "end_date": ["31/01/2010", "28/02/2010", "31/05/2010"],
+        "glacier_change_observed": [31., 28., 31.],
+        "glacier_change_uncertainty": [3.1, 2.8, 3.1],
+        "hydrological_correction_value": [1., 2., 3.],
+        "sea_level_correction_value": [0., 0., 1.]})
+    result = interpolate_change_per_day_to_fill_gaps(elevation_time_series)
+    # a row covering the gap from 01/03/2010 - 30/04/2010 is added, and end dates are joined to the next start date
+    assert result["start_date"].tolist() == ["01/01/2010", "01/02/2010", "01/03/2010", "01/05/2010"]
+    assert result["end_date"].tolist() == ["01/02/2010", "01/03/2010", "01/05/2010", "31/05/2010"]
+    assert result["glacier_change_observed"][2] == pytest.approx((28. / 27. + 31. / 30.) / 2 * 60)
+    assert result["hydrological_correction_value"][2] == 2.5